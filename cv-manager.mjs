@@ -720,6 +720,15 @@ ${details.map(d => `      "${d}"`).join(',\n')}
   }
 }
 
+// These regex-parse the TypeScript literals; after `cv_manager.py migrate --to json|shards`
+// src/data/*.ts are only loaders or an index, so refuse to run rather than corrupt them
+const storeDir = ['json', 'projects'].find(dir => fs.existsSync(path.join(__dirname, 'src', 'data', dir)));
+if (storeDir) {
+  console.error(`❌ src/data/${storeDir}/ exists, so the data is not in the TypeScript store this manager edits.`);
+  console.error('Use python3 cv_manager.py, or run: python3 cv_manager.py migrate --to ts');
+  process.exit(1);
+}
+
 // Run the manager
 const manager = new CVManager();
 manager.init().catch(error => {
@@ -0,0 +1,82 @@
+#!/usr/bin/env node
+
+/**
+ * CV Schema Validation Worker
+ *
+ * Long-lived helper for cv_manager.py: loads CVDataSchema from src/data/schemas.ts once,
+ * then validates CV data sent over stdin, one JSON document per line.
+ *
+ *   → {"id": 1, "data": {"personal": {...}, "skills": {...}, ...}}
+ *   ← {"id": 1, "ok": false, "ms": 0.41, "issues": [{"path": ["projects", 2, "slug"], "message": "...", "code": "..."}]}
+ *
+ * The first line written is {"ready": true} once the schemas are loaded, or
+ * {"ready": false, "error": "..."} before exiting. The worker exits when stdin closes.
+ */
+
+import fs from 'fs';
+import path from 'path';
+import readline from 'readline';
+import { createRequire } from 'module';
+import { fileURLToPath, pathToFileURL } from 'url';
+
+const __dirname = path.dirname(fileURLToPath(import.meta.url));
+const schemasPath = path.join(__dirname, 'src', 'data', 'schemas.ts');
+
+const send = message => process.stdout.write(JSON.stringify(message) + '\n');
+
+async function loadSchemas() {
+  // Node with type stripping enabled imports the TypeScript module directly
+  if (process.features?.typescript) {
+    return import(pathToFileURL(schemasPath).href);
+  }
+
+  // Otherwise transpile it with esbuild (installed alongside Astro). The output sits inside
+  // the project so that `import { z } from 'zod'` resolves from node_modules.
+  const require = createRequire(import.meta.url);
+  const { transformSync } = require('esbuild');
+  const { code } = transformSync(fs.readFileSync(schemasPath, 'utf8'), {
+    loader: 'ts',
+    format: 'esm',
+    sourcefile: schemasPath
+  });
+  const outDir = path.join(__dirname, '.cv-manager');
+  fs.mkdirSync(outDir, { recursive: true });
+  const outFile = path.join(outDir, 'schemas.validate.mjs');
+  fs.writeFileSync(outFile, code);
+  return import(pathToFileURL(outFile).href);
+}
+
+let schema;
+try {
+  ({ CVDataSchema: schema } = await loadSchemas());
+  if (!schema) throw new Error('schemas.ts does not export CVDataSchema');
+  send({ ready: true });
+} catch (error) {
+  send({ ready: false, error: error.message });
+  process.exit(1);
+}
+
+const lines = readline.createInterface({ input: process.stdin });
+
+lines.on('line', line => {
+  let request;
+  try {
+    request = JSON.parse(line);
+  } catch {
+    send({ id: null, error: 'Invalid JSON request' });
+    return;
+  }
+
+  const start = performance.now();
+  const result = schema.safeParse(request.data);
+  send({
+    id: request.id,
+    ok: result.success,
+    ms: Number((performance.now() - start).toFixed(2)),
+    issues: result.success
+      ? []
+      : result.error.issues.map(({ path, message, code }) => ({ path, message, code }))
+  });
+});
+
+lines.on('close', () => process.exit(0));
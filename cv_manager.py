@@ -4,17 +4,202 @@ CV Website Content Manager - Complete Version
 A comprehensive CRUD interface for managing Haashim's CV website data
 """
 
+from __future__ import annotations
+
+import copy
 import json
 import os
 import re
-from typing import Dict, List, Any, Optional
-from datetime import datetime
-import subprocess
+import sys
+import time
+from itertools import islice
 from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, List, Any, Optional, Tuple
+
+# Startup stays lean: heavier modules (subprocess, concurrent.futures, datetime, hashlib, ...)
+# are imported inside the functions that use them, so a one-shot command or the first menu
+# only pays for what it runs. `python3 cv_manager.py startup` keeps this in check.
+if TYPE_CHECKING:
+    import subprocess
+
+# Per-format templates for CV exports. Entry templates use the entry's own field names;
+# list fields render as `item` blocks under their name and joined under `<name>_inline`,
+# and `wrap` decorates a field only when it has a value.
+CV_EXPORT_TEMPLATES = {
+    "md": {
+        "header": "# {name}\n\n**{title}**\n\n{contact}\n\n{summary}\n",
+        "contact_join": " · ",
+        "section": "\n## {heading}\n",
+        "section_end": "",
+        "experience": "\n### {title} — {company}\n*{period}{location}*\n\n{points}",
+        "skills": "- **{category}:** {skills_inline}\n",
+        "projects": "\n### {name}\n{description}\n{techStack_inline}\n{achievements}",
+        "education": "\n### {degree} — {institution}\n*{period}{location}*\n{grade}{modules_inline}",
+        "certifications": "- **{name}** — {issuer}, {date}{credentialId}\n",
+        "community": "\n### {title} — {organization}\n*{period}{location}*\n\n{points}",
+        "item": "- {value}\n",
+        "join": ", ",
+        "wrap": {"location": " · {value}", "techStack_inline": "\n*{value}*\n", "grade": "\n{value}\n",
+                 "modules_inline": "\nModules: {value}\n", "credentialId": " (ID {value})"},
+        "footer": ""
+    },
+    "txt": {
+        "header": "{name}\n{title}\n{contact}\n\n{summary}\n",
+        "contact_join": " | ",
+        "section": "\n{heading_upper}\n{rule}\n",
+        "section_end": "",
+        "experience": "\n{title}, {company}\n{period}{location}\n{points}",
+        "skills": "{category}: {skills_inline}\n",
+        "projects": "\n{name}\n{description}\n{techStack_inline}{achievements}",
+        "education": "\n{degree}, {institution}\n{period}{location}\n{grade}{modules_inline}",
+        "certifications": "{name}, {issuer} ({date}){credentialId}\n",
+        "community": "\n{title}, {organization}\n{period}{location}\n{points}",
+        "item": "  * {value}\n",
+        "join": ", ",
+        "wrap": {"location": " | {value}", "techStack_inline": "Technologies: {value}\n",
+                 "grade": "{value}\n", "modules_inline": "Modules: {value}\n", "credentialId": " ID {value}"},
+        "footer": ""
+    },
+    "html": {
+        "header": ("<!DOCTYPE html>\n<html lang=\"en\">\n<head>\n<meta charset=\"utf-8\">\n"
+                   "<title>{name} - CV</title>\n<style>body{{font:15px/1.5 system-ui,sans-serif;"
+                   "max-width:50rem;margin:2rem auto;padding:0 1rem;color:#222}}h2{{border-bottom:1px solid #ccc}}"
+                   "h3{{margin-bottom:0}}.meta{{color:#666;margin:0}}</style>\n</head>\n<body>\n"
+                   "<header>\n<h1>{name}</h1>\n<p><strong>{title}</strong></p>\n<p>{contact}</p>\n"
+                   "<p>{summary}</p>\n</header>\n"),
+        "contact_join": " · ",
+        "section": "<section>\n<h2>{heading}</h2>\n",
+        "section_end": "</section>\n",
+        "experience": "<h3>{title} — {company}</h3>\n<p class=\"meta\">{period}{location}</p>\n{points}",
+        "skills": "<p><strong>{category}:</strong> {skills_inline}</p>\n",
+        "projects": "<h3>{name}</h3>\n<p>{description}</p>\n{techStack_inline}{achievements}",
+        "education": ("<h3>{degree} — {institution}</h3>\n<p class=\"meta\">{period}{location}</p>\n"
+                      "{grade}{modules_inline}"),
+        "certifications": "<p><strong>{name}</strong> — {issuer}, {date}{credentialId}</p>\n",
+        "community": "<h3>{title} — {organization}</h3>\n<p class=\"meta\">{period}{location}</p>\n{points}",
+        "item": "<li>{value}</li>\n",
+        "join": ", ",
+        "wrap": {"location": " · {value}", "points": "<ul>\n{value}</ul>\n", "achievements": "<ul>\n{value}</ul>\n",
+                 "techStack_inline": "<p class=\"meta\">{value}</p>\n", "grade": "<p>{value}</p>\n",
+                 "modules_inline": "<p>Modules: {value}</p>\n", "credentialId": " (ID {value})"},
+        "footer": "</body>\n</html>\n"
+    }
+}
+
+
+def export_fields(entry: Dict, templates: Dict, escape) -> Dict[str, str]:
+    """Template fields for one entry: escaped strings, rendered lists and wrapped optionals"""
+    from collections import defaultdict
+    item_prefix, item_suffix = templates["item"].split("{value}")
+    separator = item_suffix + item_prefix
+    fields = {}
+    for key, value in entry.items():
+        if isinstance(value, list):
+            items = [escape(item) for item in value if isinstance(item, str)]
+            fields[key] = item_prefix + separator.join(items) + item_suffix if items else ""
+            fields[f"{key}_inline"] = templates["join"].join(items)
+        elif isinstance(value, str):
+            fields[key] = escape(value)
+    for key, wrapper in templates["wrap"].items():
+        if fields.get(key):
+            fields[key] = wrapper.format(value=fields[key])
+    return defaultdict(str, fields)
+
+
+def markdown_escape(text: str) -> str:
+    """Backslash-escape Markdown metacharacters so values like `C#` or `*nix` render literally"""
+    return re.sub(r'([\\`*_\[\]#|<>])', r'\\\1', text)
+
+
+def render_cv_export(job: Dict) -> Tuple[int, float]:
+    """Stream one templated CV format to disk entry by entry (runs in a worker process)"""
+    import html
+    import itertools
+    started = time.perf_counter()
+    templates = CV_EXPORT_TEMPLATES[job["format"]]
+    escapes = {"html": lambda text: html.escape(text, quote=False), "md": markdown_escape}
+    escape = escapes.get(job["format"], str)
+    manager = CVManager()
+    personal = job["personal"]
+    header = export_fields({key: value for key, value in personal.items() if key != "contact"}, templates, escape)
+    contact = export_fields(personal.get("contact", {}), templates, escape)
+    header["contact"] = templates["contact_join"].join(value for value in contact.values() if value)
+    
+    with open(job["target"], 'w', encoding='utf-8') as f:
+        f.write(templates["header"].format_map(header))
+        for section, heading in job["headings"]:
+            if section == "skills":
+                entries = iter([{"category": category, "skills": skills} for category, skills in job["skills"].items()])
+            else:
+                entries = manager.iter_section_entries(section)
+            first = next(entries, None)
+            if first is None:
+                continue
+            f.write(templates["section"].format(heading=heading, heading_upper=heading.upper(),
+                                                rule="=" * len(heading)))
+            entry_template = templates[section]
+            f.writelines(entry_template.format_map(export_fields(entry, templates, escape))
+                         for entry in itertools.chain((first,), entries))
+            f.write(templates["section_end"])
+        f.write(templates["footer"])
+    return os.path.getsize(job["target"]), time.perf_counter() - started
+
+
+def render_image_variants(job: Dict) -> Dict:
+    """Resize one gallery image into every width/format bucket (runs in a worker process)"""
+    from PIL import Image
+    
+    saves = {
+        "avif": {"quality": 50, "speed": 6},
+        "webp": {"quality": 80, "method": 6},
+        "png": {"optimize": True}
+    }
+    variants = {fmt: [] for fmt in job["formats"]}
+    with Image.open(job["path"]) as image:
+        image.load()
+        source_width, source_height = image.size
+        widths = [w for w in job["widths"] if w < source_width] or [source_width]
+        for width in widths:
+            height = round(source_height * width / source_width)
+            resized = image.resize((width, height), Image.LANCZOS) if width != source_width else image
+            for fmt in job["formats"]:
+                frame = resized
+                if fmt != "png" and frame.mode not in ("RGB", "RGBA"):
+                    frame = frame.convert("RGBA")
+                name = f"{job['stem']}-{job['hash'][:8]}-{width}.{fmt}"
+                frame.save(Path(job["out_dir"]) / name, fmt.upper(), **saves[fmt])
+                variants[fmt].append({
+                    "src": f"{job['url_prefix']}/{name}",
+                    "width": width,
+                    "height": height,
+                    "bytes": (Path(job["out_dir"]) / name).stat().st_size
+                })
+    return {"width": source_width, "height": source_height, "variants": variants}
+
+def compress_asset(job: Dict) -> Dict:
+    """Gzip (and Brotli when available) one file at maximum compression into the cache"""
+    import gzip
+    data = Path(job["path"]).read_bytes()
+    sizes = {}
+    for suffix in job["encoders"]:
+        if suffix == "br":
+            import brotli
+            compressed = brotli.compress(data, quality=11)
+        else:
+            compressed = gzip.compress(data, compresslevel=9, mtime=0)
+        # A compressed copy only helps when it is actually smaller
+        if len(compressed) < len(data):
+            (Path(job["cache_dir"]) / f"{job['hash']}.{suffix}").write_bytes(compressed)
+            sizes[suffix] = len(compressed)
+    return sizes
 
 class CVManager:
     def __init__(self):
-        self.base_path = Path(__file__).parent / "src" / "data"
+        self.root = Path(__file__).parent
+        self.base_path = self.root / "src" / "data"
+        self.dist_path = self.root / "dist"
+        # Local, uncommitted state (manifests, caches, history)
+        self.state_dir = self.root / ".cv-manager"
         self.data_files = {
             "personal": "personal.ts",
             "skills": "skills.ts",
@@ -24,9 +209,214 @@ class CVManager:
             "certifications": "certifications.ts",
             "community": "community.ts"
         }
+        # Exported variable and type name of each data module
+        self.section_types = {
+            "personal": ("personal", "Personal"),
+            "skills": ("skills", "Skills"),
+            "experience": ("experience", "Experience[]"),
+            "projects": ("projects", "Project[]"),
+            "education": ("education", "Education[]"),
+            "certifications": ("certifications", "Certification[]"),
+            "community": ("community", "Community[]")
+        }
+        # Optional canonical JSON store: when this directory exists, json/<section>.json
+        # is the source of truth and the .ts modules just import it
+        self.json_store = self.base_path / "json"
+        # Optional sharded projects layout: projects/<slug>.ts per entry, projects.ts a generated index
+        self.project_shards_dir = self.base_path / "projects"
+        self._shard_cache = {}
+        # Build timing history and regression detection
+        self.build_history_file = self.state_dir / "build-history.jsonl"
+        self.build_regression_threshold = 20  # Percent slower than the rolling baseline
+        self.build_baseline_window = 5
+        # Long-lived `astro dev` server reused across edits (Vite HMR picks up writes)
+        self.dev_server = None
+        self.dev_host = "127.0.0.1"
+        self.dev_port = 4321
+        self.dev_log_file = self.state_dir / "astro-dev.log"
+        # Persistent Node worker running the real zod CVDataSchema after every write
+        self.validator_script = self.root / "cv-validate-worker.mjs"
+        self.schemas_file = self.base_path / "schemas.ts"
+        self.validate_on_write = True
+        self.validator_timeout = 10.0  # Seconds to load the schemas or answer one request
+        self.validator = None
+        self._validator_replies = None
+        self._validator_mtime = None
+        self._validator_requests = 0
+        self._validator_unavailable = None  # (reason, schemas.ts mtime): not retried until it changes
+        # Precompressed .gz/.br siblings for text assets in dist/
+        self.compress_cache_dir = self.state_dir / "compress"
+        self.compressible_types = (".html", ".css", ".js", ".mjs", ".json", ".xml", ".svg",
+                                   ".txt", ".map", ".webmanifest", ".ico")
+        # Page-weight budgets (compressed bytes), overridable in page-budgets.json
+        self.page_budgets_file = self.root / "page-budgets.json"
+        self.page_weights_file = self.state_dir / "page-weights.json"
+        self.default_page_budgets = {"html": 40 * 1024, "css": 30 * 1024, "js": 100 * 1024,
+                                     "images": 600 * 1024, "total": 700 * 1024}
+        # Standalone CV exports (Markdown, text, HTML, JSON Resume), in print-page order
+        self.export_dir = self.root / "cv-exports"
+        self.export_formats = ("md", "txt", "html", "json")
+        self.export_templates = CV_EXPORT_TEMPLATES
+        self.export_sections = (
+            ("experience", "Professional Experience"),
+            ("skills", "Technical Skills"),
+            ("projects", "Key Projects"),
+            ("education", "Education"),
+            ("certifications", "Certifications"),
+            ("community", "Additional Information")
+        )
+        # Cache-Control tiers written to dist/_headers after each build
+        self.headers_file = self.dist_path / "_headers"
+        self.fingerprinted_dirs = ("_assets/", "images/variants/")  # build.assets in astro.config.mjs
+        self.fingerprint_pattern = re.compile(r'\.(?=[\w-]*\d)[\w-]{8}\.\w+$')  # name.<hash8>.ext
+        self.cache_policies = {
+            "fingerprinted": "public, max-age=31536000, immutable",
+            "stable": "public, max-age=86400",
+            # Fixed short lifetimes; afterwards browsers revalidate with the ETag the host serves
+            "volatile": "public, max-age=0, must-revalidate",
+            "volatile-data": "public, max-age=300, must-revalidate"
+        }
+        # Production-like static server for dist/
+        self.serve_port = 8080
+        self.netlify_config = self.root / "netlify.toml"
+        # Startup budgets: time from launch to the menu prompt / a one-shot command's first output,
+        # as multiples of a bare `python3 -c pass` on the same machine (override with --budget)
+        self.startup_budgets = {"menu": 4.0, "--help": 5.0, "stale": 5.0, "timeline": 5.0}
+        # Modules the menu must not pay for before it is shown
+        self.startup_deferred_modules = ("argparse", "concurrent.futures", "datetime", "hashlib",
+                                         "http.server", "shutil", "sqlite3", "subprocess")
+        # Optional SQLite mirror behind the paginated "View all" lists
+        self.db_file = self.state_dir / "cv.sqlite3"
+        self.db_schema_version = 2
+        self.list_filters = ("tech", "company", "issuer", "year", "expires", "text")
+        self.list_sorts = ("position", "title", "company", "issuer", "date")
+        # Fields that identify an entry across edits (used for per-entry change tracking)
+        self.entry_keys = {
+            "experience": ("company", "title"),
+            "projects": ("slug",),
+            "education": ("institution", "degree"),
+            "certifications": ("issuer", "name"),
+            "community": ("organization", "title")
+        }
+        # Committed alongside the data so feed/sitemap dates survive fresh checkouts
+        self.content_meta_file = self.base_path / "content-meta.json"
+        # Aggregates precomputed for the site so pages read constants instead of rescanning
+        self.derived_file = self.base_path / "derived.ts"
+        self.derived_sections = ("skills", "experience", "projects")
+        self._section_cache = {}
+        # Free-text periods ("Jan 2025 - Current", "2022 - 2023") normalised to month ranges
+        self._period_cache = {}
+        self.month_names = ("jan", "feb", "mar", "apr", "may", "jun",
+                            "jul", "aug", "sep", "oct", "nov", "dec")
+        self.ongoing_words = ("present", "current", "now", "ongoing")
+        # Sections kept newest-first when entries are added
+        self.chronological_sections = ("experience", "education", "certifications", "community")
+        # Structural tokens for the streaming parser (comments and string literals are skipped whole)
+        self.structure_pattern = re.compile(
+            rb'//[^\n]*|/\*.*?\*/|"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'|[{}\[\]]', re.DOTALL)
+        # Responsive gallery variants (requires Pillow; AVIF needs Pillow 11.3+ or pillow-avif-plugin)
+        self.public_path = self.root / "public"
+        self.image_variants_dir = self.public_path / "images" / "variants"
+        self.image_variants_file = self.base_path / "image-variants.json"
+        self.image_widths = (480, 960, 1600)
+        self.image_formats = ("avif", "webp", "png")
+        # Intrinsic size/weight of images read from their headers (no decoding, stdlib only)
+        self.image_meta_file = self.base_path / "image-meta.json"
+        self.image_probe_cache = self.state_dir / "image-probe.json"
+        self.image_weight_warning = 1024 * 1024  # Bytes
+        self.image_types = (".png", ".jpg", ".jpeg", ".webp", ".gif", ".svg", ".avif")
+        # Prefix-sharded search index served to the browser from public/search/
+        self.search_dir = self.public_path / "search"
+        self.search_cache_dir = self.state_dir / "search"
+        self.search_prefix_length = 2
+        self.search_doc_prefix_length = 1  # Display data is sharded by section + slug prefix
+        self.search_fields = {
+            "projects": {"name": 5, "techStack": 4, "description": 2, "features": 1,
+                         "achievements": 1, "detailedDescription": 1},
+            "experience": {"title": 5, "company": 4, "location": 1, "points": 1},
+            "skills": {"category": 5, "skills": 4}
+        }
+        self.search_stopwords = frozenset(
+            "an and are as at be by for from has in into is it of on or our that the this to via was were with".split())
+        
+        # Per-resource static JSON API (public/api/<section>.json, projects/<slug>.json, index.json)
+        self.static_api_dir = self.public_path / "api"
+        
+        # Write-time steps and the sections (and fields; None = any change) each depends on.
+        # "position" stands for entries being added, removed or reordered; an optional "when"
+        # skips a step whose output isn't in use.
+        every_section = {section: None for section in self.data_files}
+        self.write_steps = {
+            "content-meta": {"sections": every_section,
+                             "run": lambda section, data: self.update_content_meta(section, data)},
+            "derived": {"sections": {"skills": None,
+                                     "projects": ("techStack", "live", "github", "position"),
+                                     "experience": ("period",)},
+                        "run": lambda section, data: self.write_derived_data()},
+            "image-variants": {"sections": {"projects": ("gallery",)},
+                               "run": lambda section, data: self.generate_image_variants(quiet=True)},
+            "image-meta": {"sections": {"projects": ("gallery",)},
+                           "run": lambda section, data: self.probe_gallery_images(quiet=True)},
+            "search-index": {"sections": {"skills": None,
+                                          "projects": tuple(self.search_fields["projects"]) + ("slug",),
+                                          "experience": tuple(self.search_fields["experience"]) + ("period",)},
+                             "run": lambda section, data: self.update_search_index([section])},
+            "static-api": {"sections": every_section,
+                           "run": lambda section, data: self.write_static_api([section])},
+            "db-mirror": {"sections": {section: None for section in self.data_files if section != "personal"},
+                          "when": self.db_file.exists,
+                          "run": lambda section, data: self.sync_section_db(section, data)}
+        }
+        # Site outputs and the sections they render. The layout's meta tags read personal and
+        # the technology list, so every page depends on personal and skills.
+        self.page_dependencies = {
+            "/": tuple(self.data_files),
+            "/cv-print": tuple(self.data_files),
+            "/api/cv.json": tuple(self.data_files),
+            "/sitemap.xml": tuple(self.data_files),  # lastmod comes from content-meta
+            "/rss.xml": ("personal", "skills", "projects"),
+            "/projects/{slug}": ("personal", "skills", "projects")
+        }
+        # Pages rendered once per entry: an edit only stales that entry's page unless it touches
+        # fields other pages show too (related-project cards, site-wide keywords, routes)
+        self.per_entry_pages = {"/projects/{slug}": ("projects", ("name", "slug", "description", "techStack",
+                                                                  "position"))}
+        self.stale_outputs_file = self.state_dir / "stale-outputs.json"
         
+    @property
+    def use_json_store(self) -> bool:
+        """Whether the canonical JSON store is the source of truth"""
+        return self.json_store.is_dir()
+    
+    @property
+    def use_project_shards(self) -> bool:
+        """Whether projects live in one module per entry (TypeScript store only)"""
+        return self.project_shards_dir.is_dir() and not self.use_json_store
+    
+    @property
+    def storage_mode(self) -> str:
+        """Active data layout: json, shards or ts"""
+        if self.use_json_store:
+            return "json"
+        return "shards" if self.use_project_shards else "ts"
+    
+    def source_file(self, section: str) -> Path:
+        """File that holds a section's data in the active storage mode"""
+        if self.use_json_store:
+            return self.json_store / f"{section}.json"
+        return self.base_path / self.data_files[section]
+    
     def parse_ts_file(self, filepath: Path) -> Any:
         """Parse TypeScript file and extract the data"""
+        if filepath.stem == "projects" and self.use_project_shards:
+            # Copies: callers edit entries in place, which must not alter the cached shards
+            return copy.deepcopy(list(self.iter_project_shards()))
+        if self.use_json_store:
+            json_file = self.json_store / f"{filepath.stem}.json"
+            if json_file.exists():
+                with open(json_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        
         if not filepath.exists():
             return [] if 'experience' in str(filepath) or 'project' in str(filepath) else {}
             
@@ -41,6 +431,31 @@ class CVManager:
         else:
             return self.parse_array(content)
     
+    def file_key(self, filepath: Path) -> Optional[Tuple[int, int]]:
+        """Cheap change detector for a file (mtime + size)"""
+        try:
+            stat = filepath.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def section_key(self, section: str) -> Any:
+        """Change detector for everything a section is read from"""
+        if section == "projects" and self.use_project_shards:
+            index = self.source_file(section)
+            return (self.file_key(index),) + tuple(self.file_key(path) for path in self.project_shard_paths())
+        return self.file_key(self.source_file(section))
+    
+    def load_section(self, section: str) -> Any:
+        """Parse a section once and reuse it until its file changes (read-only)"""
+        key = self.section_key(section)
+        cached = self._section_cache.get(section)
+        if cached and cached[0] == key:
+            return cached[1]
+        data = self.parse_ts_file(self.base_path / self.data_files[section])
+        self._section_cache[section] = (key, data)
+        return data
+    
     def parse_personal(self, content: str) -> Dict:
         """Parse personal information"""
         data = {}
@@ -82,11 +497,11 @@ class CVManager:
         if skills_match:
             skills_content = skills_match.group(1)
             
-            # Parse each category
-            category_pattern = r'(\w+):\s*\[(.*?)\]'
+            # Parse each category (keys may be bare identifiers or quoted strings)
+            category_pattern = r'(?:"([^"]+)"|(\w+)):\s*\[(.*?)\]'
             for match in re.finditer(category_pattern, skills_content, re.DOTALL):
-                category = match.group(1)
-                items_str = match.group(2)
+                category = match.group(1) or match.group(2)
+                items_str = match.group(3)
                 
                 # Extract individual skills
                 items = re.findall(r'"([^"]*)"', items_str)
@@ -102,47 +517,645 @@ class CVManager:
         pattern = r'\{([^{}]*(?:\{[^{}]*\}[^{}]*)*)\}'
         
         for match in re.finditer(pattern, content):
-            obj_str = match.group(1)
-            obj = {}
-            
-            # Extract string fields
-            for field_match in re.finditer(r'(\w+):\s*"([^"]*)"', obj_str):
-                field_name = field_match.group(1)
-                field_value = field_match.group(2)
-                obj[field_name] = field_value
-            
-            # Extract array fields (points, techStack, modules, skills, etc.)
-            for array_match in re.finditer(r'(\w+):\s*\[(.*?)\]', obj_str, re.DOTALL):
-                field_name = array_match.group(1)
-                array_content = array_match.group(2)
-                items_list = re.findall(r'"([^"]*)"', array_content)
-                obj[field_name] = items_list
-            
-            if obj and any(key in obj for key in ['title', 'name', 'degree', 'company', 'organization', 'institution', 'issuer']):
+            obj = self.parse_object(match.group(1))
+            if obj:
                 items.append(obj)
         
         return items
     
-    def write_ts_file(self, filepath: Path, data: Any, var_name: str, type_name: str):
-        """Write data back to TypeScript file preserving interfaces"""
-        # Read original to get interface
-        interface_def = ""
+    def parse_object(self, obj_str: str) -> Optional[Dict]:
+        """Parse the body of one object literal; None if it isn't a data entry"""
+        # Pull out arrays of nested objects (e.g. gallery) before the flat fields
+        obj_str, obj = self.extract_object_arrays(obj_str)
+        
+        # Extract string fields
+        for field_match in re.finditer(r'\b(\w+):\s*"([^"]*)"', obj_str):
+            field_name = field_match.group(1)
+            field_value = field_match.group(2)
+            obj[field_name] = field_value
+        
+        # Extract array fields (points, techStack, modules, skills, etc.)
+        for array_match in re.finditer(r'\b(\w+):\s*\[(.*?)\]', obj_str, re.DOTALL):
+            field_name = array_match.group(1)
+            array_content = array_match.group(2)
+            items_list = re.findall(r'"([^"]*)"', array_content)
+            obj[field_name] = items_list
+        
+        if obj and any(key in obj for key in ['title', 'name', 'degree', 'company', 'organization', 'institution', 'issuer']):
+            return obj
+        return None
+    
+    def scan_objects(self, buffer, pos: int) -> Iterator[Tuple[int, int]]:
+        """Yield (start, end) of each top-level object in an array body starting at pos.
+        
+        Only structural characters and whole string literals are visited, so the
+        scan works directly on an mmap without decoding the file.
+        """
+        depth, begin = 0, None
+        for token in self.structure_pattern.finditer(buffer, pos):
+            char = token.group()[:1]
+            if char in (b'{', b'['):
+                if depth == 0 and char == b'{':
+                    begin = token.start()
+                depth += 1
+            elif char in (b'}', b']'):
+                if depth == 0:
+                    return  # End of the enclosing array
+                depth -= 1
+                if depth == 0 and begin is not None:
+                    yield begin, token.end()
+                    begin = None
+    
+    def iter_section_entries(self, section: str) -> Iterator[Dict]:
+        """Yield a section's entries one at a time from a memory-mapped data file.
+        
+        Nothing past the last entry consumed is decoded or parsed, so callers can
+        stop early and peak memory stays around one entry.
+        """
+        import mmap
+        if section == "projects" and self.use_project_shards:
+            yield from self.iter_project_shards()
+            return
+        filepath = self.source_file(section)
+        if not filepath.exists() or filepath.stat().st_size == 0:
+            return
+        
+        with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if filepath.suffix == ".json":
+                start = mm.find(b'[')
+            else:
+                export = mm.find(b'export const')
+                start = mm.find(b'[', mm.find(b'=', max(export, 0)))
+            if start < 0:
+                return
+            
+            for begin, end in self.scan_objects(mm, start + 1):
+                text = mm[begin:end].decode('utf-8')
+                entry = json.loads(text) if filepath.suffix == ".json" else self.parse_object(text[1:-1])
+                if entry:
+                    yield entry
+    
+    def project_shard_paths(self) -> List[Path]:
+        """Project modules in index order (as imported by projects.ts)"""
+        index = self.base_path / self.data_files["projects"]
+        if not index.exists():
+            return []
+        stems = re.findall(r"from '\./projects/([^']+)'", index.read_text())
+        return [self.project_shards_dir / f"{stem}.ts" for stem in stems]
+    
+    def iter_project_shards(self) -> Iterator[Dict]:
+        """Yield projects from their per-entry modules, reparsing only files that changed"""
+        for path in self.project_shard_paths():
+            key = self.file_key(path)
+            cached = self._shard_cache.get(path.stem)
+            if cached and cached[0] == key:
+                yield cached[1]
+                continue
+            if key is None:
+                continue
+            with open(path, 'rb') as f:
+                content = f.read()
+            export = content.find(b'export const')
+            entry = None
+            for begin, end in self.scan_objects(content, content.find(b'=', max(export, 0)) + 1):
+                entry = self.parse_object(content[begin + 1:end - 1].decode('utf-8'))
+                break
+            if entry:
+                self._shard_cache[path.stem] = (key, entry)
+                yield entry
+    
+    def shard_stem(self, project: Dict) -> str:
+        """Module filename (without .ts) for a project"""
+        return self.search_slug(project.get('slug', '')) or "project"
+    
+    def write_project_shards(self, data: List[Dict], previous: Optional[List[Dict]] = None) -> int:
+        """Write each project to projects/<slug>.ts, touching only entries that changed, and
+        regenerate the index module only when the set or order of projects changes"""
+        index = self.base_path / self.data_files["projects"]
+        self.project_shards_dir.mkdir(exist_ok=True)
+        unchanged = {project.get('slug'): project for project in previous or []}
+        
+        stems, written = [], 0
+        for project in data:
+            stem = self.shard_stem(project)
+            if stem in stems:
+                stem = f"{stem}-{len(stems)}"
+            stems.append(stem)
+            path = self.project_shards_dir / f"{stem}.ts"
+            if unchanged.get(project.get('slug')) == project and path.exists():
+                continue
+            with open(path, 'w') as f:
+                f.write(f"import type {{ Project }} from '../projects';\n\n"
+                        f"export const project: Project = {self.to_typescript(project)};\n")
+            self._shard_cache[stem] = (self.file_key(path), copy.deepcopy(project))
+            print(f"✓ Updated projects/{path.name}")
+            written += 1
+        
+        for path in self.project_shards_dir.glob("*.ts"):
+            if path.stem not in stems:
+                path.unlink()
+                self._shard_cache.pop(path.stem, None)
+                print(f"✓ Removed projects/{path.name}")
+        
+        # A fixed prefix keeps aliases valid identifiers (slugs may start with a digit)
+        # and clear of the module's own `projects` export
+        names = [f"p_{stem.replace('-', '_')}" for stem in stems]
+        imports = "".join(f"import {{ project as {name} }} from './projects/{stem}';\n"
+                          for name, stem in zip(names, stems))
+        content = ("// Generated by cv_manager.py - edit projects/<slug>.ts (or use the manager).\n"
+                   f"{imports}\n{self.read_interface(index)}"
+                   f"export const projects: Project[] = [{', '.join(names)}];\n")
+        if not index.exists() or index.read_text() != content:
+            with open(index, 'w') as f:
+                f.write(content)
+            print(f"✓ Updated {index.name} (index)")
+        return written
+    
+    def extract_object_arrays(self, obj_str: str) -> Tuple[str, Dict]:
+        """Parse `field: [{...}, ...]` arrays and strip them from the object source"""
+        nested = {}
+        pattern = re.compile(r'\b(\w+):\s*\[\s*\{')
+        match = pattern.search(obj_str)
+        while match:
+            # Walk to the closing bracket of this array
+            depth = 0
+            end = match.end() - 1
+            for end in range(match.end() - 1, len(obj_str)):
+                char = obj_str[end]
+                if char in '[{':
+                    depth += 1
+                elif char in ']}':
+                    depth -= 1
+                    if depth < 0:
+                        break
+            array_str = obj_str[match.end() - 1:end]
+            nested[match.group(1)] = [
+                dict(re.findall(r'(\w+):\s*"([^"]*)"', inner))
+                for inner in re.findall(r'\{([^{}]*)\}', array_str)
+            ]
+            obj_str = obj_str[:match.start()] + obj_str[end + 1:]
+            match = pattern.search(obj_str)
+        return obj_str, nested
+    
+    def read_interface(self, filepath: Path) -> str:
+        """Interface declarations of an existing data module"""
         if filepath.exists():
             with open(filepath, 'r') as f:
-                original = f.read()
-                interface_match = re.search(r'(export interface.*?\n\})', original, re.DOTALL)
+                interface_match = re.search(r'(export interface.*?\n\})', f.read(), re.DOTALL)
                 if interface_match:
-                    interface_def = interface_match.group(1) + "\n\n"
+                    return interface_match.group(1) + "\n\n"
+        return ""
+    
+    def write_ts_file(self, filepath: Path, data: Any, var_name: str, type_name: str):
+        """Write data back to TypeScript file preserving interfaces"""
+        # Previous version (usually cached) lets after_write work out what actually changed
+        previous = self.load_section(filepath.stem) if self.source_file(filepath.stem).exists() else None
+        if self.validate_on_write and filepath.stem in self.data_files:
+            self.check_pending_section(filepath.stem, data)
+        if filepath.stem == "projects" and self.use_project_shards:
+            self.write_project_shards(data, previous)
+            self.after_write(filepath.stem, data, previous)
+            return
+        if self.use_json_store:
+            self.write_json_section(filepath, data, var_name, type_name)
+        else:
+            # Generate TypeScript content
+            interface_def = self.read_interface(filepath)
+            ts_data = self.to_typescript(data, indent=0)
+            content = f"{interface_def}export const {var_name}: {type_name} = {ts_data};\n"
+            
+            # Write to file
+            with open(filepath, 'w') as f:
+                f.write(content)
+        
+        print(f"✓ Updated {filepath.name}")
+        self.after_write(filepath.stem, data, previous)
+    
+    def write_json_section(self, filepath: Path, data: Any, var_name: str, type_name: str):
+        """Write a section to the canonical JSON store, keeping its .ts module a thin import"""
+        json_file = self.json_store / f"{filepath.stem}.json"
+        with open(json_file, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(data, ensure_ascii=False, separators=(',', ':')) + "\n")
         
-        # Generate TypeScript content
-        ts_data = self.to_typescript(data, indent=0)
-        content = f"{interface_def}export const {var_name}: {type_name} = {ts_data};\n"
+        import_line = f"import data from './json/{json_file.name}';"
+        if not filepath.exists() or import_line not in filepath.read_text():
+            content = (f"{import_line}\n\n{self.read_interface(filepath)}"
+                       f"export const {var_name}: {type_name} = data as {type_name};\n")
+            with open(filepath, 'w') as f:
+                f.write(content)
+    
+    def migrate_store(self, target: str):
+        """Move every section between the TypeScript literal, sharded-projects and canonical JSON stores"""
+        import shutil
+        sections = {section: self.load_section(section) for section in self.data_files}
+        projects_file = self.base_path / self.data_files["projects"]
+        if target == "shards":
+            if self.use_json_store:
+                self.migrate_store("ts")
+            self.write_project_shards(sections["projects"])
+            self._section_cache.clear()
+            return
+        if self.use_project_shards:
+            # Collapse the shards back into a single projects.ts literal first
+            content = (f"{self.read_interface(projects_file)}"
+                       f"export const projects: Project[] = {self.to_typescript(sections['projects'])};\n")
+            with open(projects_file, 'w') as f:
+                f.write(content)
+            shutil.rmtree(self.project_shards_dir)
+            self._shard_cache.clear()
+            print("✓ Merged projects/ into projects.ts")
+            if target == "ts":
+                self._section_cache.clear()
+                return
+        if target == "json":
+            self.json_store.mkdir(exist_ok=True)
+        else:
+            # Leave JSON mode first so the writes below regenerate full TS literals
+            backup = self.base_path / "json.migrated"
+            if backup.exists():
+                shutil.rmtree(backup)
+            self.json_store.rename(backup)
         
-        # Write to file
-        with open(filepath, 'w') as f:
-            f.write(content)
+        for section, data in sections.items():
+            var_name, type_name = self.section_types[section]
+            filepath = self.base_path / self.data_files[section]
+            if target == "json":
+                self.write_json_section(filepath, data, var_name, type_name)
+            else:
+                content = (f"{self.read_interface(filepath)}"
+                           f"export const {var_name}: {type_name} = {self.to_typescript(data)};\n")
+                with open(filepath, 'w') as f:
+                    f.write(content)
+            print(f"✓ Migrated {section}")
         
-        print(f"✓ Updated {filepath.name}")
+        if target == "ts":
+            shutil.rmtree(self.base_path / "json.migrated")
+        self._section_cache.clear()
+    
+    def after_write(self, section: str, data: Any, previous: Any = None):
+        """Run the write-time steps that depend on what changed in a section, skip the rest,
+        and record which site outputs are stale until the next build"""
+        # A copy, so the caller editing data again before its next write still shows up as a change
+        self._section_cache[section] = (self.section_key(section), copy.deepcopy(data))
+        entries, fields = self.diff_section(section, previous, data)
+        
+        ran, skipped = [], []
+        for step, spec in self.write_steps.items():
+            if section not in spec["sections"] or not spec.get("when", lambda: True)():
+                continue
+            watched = spec["sections"][section]
+            if fields is None or watched is None or fields & set(watched):
+                spec["run"](section, data)
+                ran.append(step)
+            else:
+                skipped.append(step)
+        if ran or skipped:
+            print(f"↻ Regenerated: {', '.join(ran) or 'nothing'}"
+                  + (f" · skipped (unaffected): {', '.join(skipped)}" if skipped else ""))
+        
+        stale = self.affected_outputs(section, entries, fields, data)
+        if stale:
+            self.mark_stale(stale)
+            shown = ", ".join(stale[:5]) + (f" and {len(stale) - 5} more" if len(stale) > 5 else "")
+            print(f"📄 Stale until next build: {shown}")
+        
+        if self.dev_server is not None and self.ensure_dev_server():
+            print(f"🔄 Preview updating at {self.dev_server_url}")
+    
+    def diff_section(self, section: str, old: Any, new: Any) -> Tuple[Optional[set], Optional[set]]:
+        """Changed entry keys and field names between two versions of a section.
+        None means unknown (no previous version), so everything counts as changed;
+        a reorder, insert or delete adds the pseudo-field "position"."""
+        if old is None:
+            return None, None
+        if isinstance(old, dict) and isinstance(new, dict):
+            # personal fields / skill categories are both the entries and the fields
+            changed = {key for key in old.keys() | new.keys() if old.get(key) != new.get(key)}
+            return changed, changed
+        old_keys = [self.entry_key(section, entry) for entry in old]
+        new_keys = [self.entry_key(section, entry) for entry in new]
+        if len(set(old_keys)) != len(old_keys) or len(set(new_keys)) != len(new_keys):
+            return None, None  # Ambiguous identities: assume everything changed
+        
+        old_entries, new_entries = dict(zip(old_keys, old)), dict(zip(new_keys, new))
+        entries, fields = set(), set()
+        for key in old_entries.keys() | new_entries.keys():
+            before, after = old_entries.get(key, {}), new_entries.get(key, {})
+            if before != after:
+                entries.add(key)
+                fields |= {field for field in before.keys() | after.keys() if before.get(field) != after.get(field)}
+        if old_keys != new_keys:
+            fields.add("position")
+        return entries, fields
+    
+    def affected_outputs(self, section: str, entries: Optional[set], fields: Optional[set], data: Any) -> List[str]:
+        """Site outputs (per the declared page dependencies) a change to section makes stale"""
+        if fields is not None and not fields:
+            return []
+        outputs = []
+        for page, sections in self.page_dependencies.items():
+            if section not in sections:
+                continue
+            per_entry = self.per_entry_pages.get(page)
+            if per_entry and per_entry[0] == section and fields is not None and not fields & set(per_entry[1]):
+                # Only the changed entries' own pages
+                outputs.extend(page.format(**self.entry_fields(section, key)) for key in sorted(entries))
+            elif per_entry and per_entry[0] == section:
+                outputs.extend(page.format(**entry) for entry in data)
+            elif per_entry:
+                outputs.extend(page.format(**entry) for entry in self.load_section(per_entry[0]))
+            else:
+                outputs.append(page)
+        return outputs
+    
+    def entry_fields(self, section: str, key: str) -> Dict[str, str]:
+        """Identity fields of an entry from its entry_key"""
+        return dict(zip(self.entry_keys[section], key.split("::")))
+    
+    def mark_stale(self, outputs: List[str]):
+        """Remember outputs that need a rebuild (cleared by a successful build)"""
+        from datetime import datetime, timezone
+        stale = self.load_stale_outputs()
+        now = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        for output in outputs:
+            stale.setdefault(output, now)
+        self.state_dir.mkdir(exist_ok=True)
+        with open(self.stale_outputs_file, 'w', encoding='utf-8') as f:
+            json.dump(stale, f, indent=2, sort_keys=True)
+    
+    def load_stale_outputs(self) -> Dict[str, str]:
+        """Stale site outputs and when each first went stale"""
+        if not self.stale_outputs_file.exists():
+            return {}
+        with open(self.stale_outputs_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def show_stale_outputs(self):
+        """List outputs edited since the last successful build"""
+        stale = self.load_stale_outputs()
+        if not stale:
+            print("✓ Built output is up to date with the data")
+            return
+        print(f"\n📄 {len(stale)} output(s) stale since the last build:")
+        for output, since in sorted(stale.items()):
+            print(f"  {output:<40} since {since}")
+    
+    def refresh_artifacts(self):
+        """Recompute write-time artifacts for every section (e.g. after hand edits)"""
+        for section in self.data_files:
+            self.update_content_meta(section, self.load_section(section))
+        self.write_derived_data()
+        self.update_search_index()
+        self.write_static_api()
+        if self.db_file.exists():
+            self.rebuild_db()
+    
+    def parse_month(self, text: str, end: bool = False) -> Optional[int]:
+        """Month ordinal (year * 12 + month - 1) of "Sep 2017" or "2017" (January, or December for an end)"""
+        match = re.search(r'(?:\b([A-Za-z]{3})[A-Za-z]*\.?\s+)?(\d{4})\b', text)
+        if not match:
+            return None
+        month_name = (match.group(1) or "").lower()
+        if month_name in self.month_names:
+            month = self.month_names.index(month_name)
+        else:
+            month = 11 if end else 0
+        return int(match.group(2)) * 12 + month
+    
+    def parse_period(self, text: str) -> Optional[Tuple[int, Optional[int]]]:
+        """(start, end) month ordinals of a period or date string, end None while ongoing.
+        Planned or unparseable text gives None. Results are cached per distinct string."""
+        text = text or ""
+        if text in self._period_cache:
+            return self._period_cache[text]
+        
+        result = None
+        if "planned" not in text.lower():
+            parts = re.split(r'\s*(?:[-–—]|\bto\b)\s*', text.strip(), maxsplit=1)
+            start = self.parse_month(parts[0])
+            if start is not None:
+                if len(parts) == 1:
+                    result = (start, self.parse_month(parts[0], end=True))
+                elif parts[1].strip().lower() in self.ongoing_words:
+                    result = (start, None)
+                else:
+                    end = self.parse_month(parts[1], end=True)
+                    if end is not None:
+                        result = (start, max(start, end))
+        self._period_cache[text] = result
+        return result
+    
+    def entry_period(self, entry: Dict) -> Optional[Tuple[int, Optional[int]]]:
+        """Parsed period (or single date) of an entry"""
+        return self.parse_period(entry.get('period') or entry.get('date') or "")
+    
+    def current_month(self) -> int:
+        """Month ordinal of today, used to close ongoing periods"""
+        from datetime import datetime
+        today = datetime.now()
+        return today.year * 12 + today.month - 1
+    
+    def format_month(self, month: int) -> str:
+        """Month ordinal as YYYY-MM"""
+        return f"{month // 12}-{month % 12 + 1:02d}"
+    
+    def period_sort_key(self, entry: Dict) -> Tuple:
+        """Newest-first order: ongoing, then latest end, then latest start; unparsed last"""
+        period = self.entry_period(entry)
+        if period is None:
+            return (1, 0, 0, 0)
+        start, end = period
+        return (0, 0 if end is None else 1, -(end or 0), -start)
+    
+    def insert_chronologically(self, section: str, data: List[Dict], entry: Dict) -> int:
+        """Add an entry and re-sort the section newest-first; returns the entry's new index"""
+        data.append(entry)
+        if section in self.chronological_sections:
+            # Stable sort: entries with equal or unparsed periods keep their relative order
+            data.sort(key=self.period_sort_key)
+        return next(i for i, item in enumerate(data) if item is entry)
+    
+    def merge_periods(self, periods: List[Tuple[int, Optional[int]]]) -> List[Tuple[int, Optional[int]]]:
+        """Union of month ranges (inclusive), oldest first; an ongoing range absorbs later ones"""
+        merged = []
+        for start, end in sorted(periods, key=lambda period: period[0]):
+            if merged and (merged[-1][1] is None or start <= merged[-1][1] + 1):
+                last_start, last_end = merged[-1]
+                merged[-1] = (last_start, None if end is None or last_end is None else max(last_end, end))
+            else:
+                merged.append((start, end))
+        return merged
+    
+    def total_months(self, periods: List[Tuple[int, Optional[int]]]) -> int:
+        """Months covered by the union of the given ranges, counting ongoing ones to today"""
+        now = self.current_month()
+        return sum(max(0, (now if end is None else end) - start + 1) for start, end in self.merge_periods(periods))
+    
+    def has_month(self, entry: Dict, end: bool) -> bool:
+        """Whether the start (or end) of an entry's period names a month rather than just a year"""
+        text = entry.get('period') or entry.get('date') or ""
+        parts = re.split(r'\s*(?:[-–—]|\bto\b)\s*', text.strip(), maxsplit=1)
+        match = re.search(r'\b([A-Za-z]{3})[A-Za-z]*\.?\s+\d{4}', parts[-1] if end else parts[0])
+        return bool(match) and match.group(1).lower() in self.month_names
+    
+    def period_issues(self, section: str, data: List[Dict]) -> List[str]:
+        """Overlaps and gaps (of a month or more) between consecutive entries"""
+        dated = sorted(((period, entry) for entry in data if (period := self.entry_period(entry))),
+                       key=lambda item: item[0][0])
+        issues = []
+        now = self.current_month()
+        previous = None  # (end, entry) of the range reaching furthest so far
+        for (start, end), entry in dated:
+            end_value = now if end is None else end
+            if previous:
+                last_end, last_entry = previous
+                names = f"{self.entry_key(section, last_entry)} / {self.entry_key(section, entry)}"
+                # "2021 - 2022" then "2022 - 2023" only overlap because the years are coarse
+                coarse = start // 12 == last_end // 12 and not (
+                    self.has_month(entry, end=False) and self.has_month(last_entry, end=True))
+                if start <= last_end and not coarse:
+                    issues.append(f"overlap of {min(last_end, end_value) - start + 1} month(s): {names}")
+                elif start > last_end + 1:
+                    issues.append(f"gap of {start - last_end - 1} month(s): {names}")
+            if not previous or end_value > previous[0]:
+                previous = (end_value, entry)
+        return issues
+    
+    def show_timeline(self, section: str = "experience"):
+        """Print a section's normalised periods, overlaps/gaps and total covered time"""
+        data = self.load_section(section)
+        print(f"\n--- {section.upper()} TIMELINE ---")
+        for entry in sorted(data, key=self.period_sort_key):
+            period = self.entry_period(entry)
+            if period:
+                start, end = period
+                span = f"{self.format_month(start)} → {'now' if end is None else self.format_month(end)}"
+            else:
+                span = "unparsed"
+            text = entry.get('period') or entry.get('date') or ""
+            print(f"  {span:<20} {text:<24} {self.entry_key(section, entry)}")
+        
+        for issue in self.period_issues(section, data):
+            print(f"⚠️  {issue}")
+        months = self.total_months([p for p in map(self.entry_period, data) if p])
+        print(f"✓ Total covered: {months // 12} year(s) {months % 12} month(s)")
+    
+    def compute_derived_data(self) -> Dict:
+        """Aggregates the site would otherwise recompute on every render"""
+        skills = self.load_section("skills")
+        projects = self.load_section("projects")
+        experience = self.load_section("experience")
+        
+        technologies = set()
+        for skill_list in skills.values():
+            technologies.update(skill_list)
+        project_tech = set()
+        for project in projects:
+            project_tech.update(project.get('techStack', []))
+        technologies.update(project_tech)
+        
+        periods = [period for period in map(self.entry_period, experience) if period]
+        
+        return {
+            "technologies": sorted(technologies),
+            "projectStats": {
+                "total": len(projects),
+                "withLiveDemo": sum(1 for p in projects if p.get('live')),
+                "openSource": sum(1 for p in projects if p.get('github')),
+                "technologies": len(project_tech)
+            },
+            # Merged month ranges; the site adds up months to today for ongoing ones
+            "experienceRanges": [[self.format_month(start), None if end is None else self.format_month(end)]
+                                 for start, end in self.merge_periods(periods)]
+        }
+    
+    def derived_content(self) -> str:
+        """Source of src/data/derived.ts for the current data"""
+        derived = self.compute_derived_data()
+        lines = [
+            "// Generated by cv_manager.py from the data modules - do not edit by hand.",
+            "// Regenerate with: python3 cv_manager.py refresh",
+            ""
+        ]
+        types = {
+            "technologies": "string[]",
+            "projectStats": "{ total: number; withLiveDemo: number; openSource: number; technologies: number }",
+            "experienceRanges": "[string, string | null][]"
+        }
+        for name, value in derived.items():
+            lines.append(f"export const {name}: {types[name]} = {json.dumps(value, ensure_ascii=False)};")
+        return "\n".join(lines) + "\n"
+    
+    def derived_data_current(self) -> bool:
+        """Whether src/data/derived.ts matches the data (edits outside this manager leave it stale)"""
+        return self.derived_file.exists() and self.derived_file.read_text() == self.derived_content()
+    
+    def write_derived_data(self) -> bool:
+        """Emit src/data/derived.ts, touching it only when the aggregates change"""
+        if self.derived_data_current():
+            return False
+        self.derived_file.write_text(self.derived_content())
+        return True
+    
+    def content_hash(self, data: Any) -> str:
+        """Stable short hash of a JSON-serialisable value"""
+        import hashlib
+        canonical = json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+    
+    def entry_key(self, section: str, entry: Dict) -> str:
+        """Identity of an entry within its section (slug for projects)"""
+        fields = self.entry_keys.get(section, ())
+        return "::".join(str(entry.get(field, "")) for field in fields)
+    
+    def load_content_meta(self) -> Dict:
+        """Load the content hash / timestamp store"""
+        if self.content_meta_file.exists():
+            with open(self.content_meta_file, 'r') as f:
+                return json.load(f)
+        return {"version": 1, "sections": {}}
+    
+    def update_content_meta(self, section: str, data: Any):
+        """Record content hashes and first-seen/last-modified times for a section.
+        
+        Timestamps only move when a hash changes, so rewriting unchanged content
+        leaves the store (and every output derived from it) byte-identical.
+        """
+        from datetime import datetime, timezone
+        meta = self.load_content_meta()
+        original = json.dumps(meta, sort_keys=True)
+        now = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+        
+        def stamp(previous: Optional[Dict], digest: str) -> Dict:
+            if previous and previous.get('hash') == digest:
+                return previous
+            return {
+                "hash": digest,
+                "firstSeen": previous.get('firstSeen', now) if previous else now,
+                "lastModified": now
+            }
+        
+        sections = meta.setdefault('sections', {})
+        previous = sections.get(section, {})
+        record = stamp({k: v for k, v in previous.items() if k != 'entries'}, self.content_hash(data))
+        
+        if section in self.entry_keys and isinstance(data, list):
+            old_entries = previous.get('entries', {})
+            entries = {}
+            for entry in data:
+                key = base_key = self.entry_key(section, entry)
+                suffix = 2
+                while key in entries:  # Duplicate identities stay distinguishable
+                    key = f"{base_key}#{suffix}"
+                    suffix += 1
+                entries[key] = stamp(old_entries.get(key), self.content_hash(entry))
+            record = dict(record, entries=entries)
+        
+        sections[section] = record
+        if json.dumps(meta, sort_keys=True) != original:
+            with open(self.content_meta_file, 'w') as f:
+                json.dump(meta, f, indent=2, sort_keys=True, ensure_ascii=False)
+                f.write("\n")
     
     def to_typescript(self, data: Any, indent: int = 0) -> str:
         """Convert Python data to TypeScript format"""
@@ -157,7 +1170,8 @@ class CVManager:
             for key, value in data.items():
                 if value or value == "":  # Include empty strings
                     ts_value = self.to_typescript(value, indent + 1)
-                    lines.append(f'{next_ind}{key}: {ts_value},')
+                    ts_key = key if re.fullmatch(r'[A-Za-z_$][\w$]*', key) else json.dumps(key)
+                    lines.append(f'{next_ind}{ts_key}: {ts_value},')
             lines.append(f"{ind}}}")
             return "\n".join(lines)
             
@@ -203,6 +1217,198 @@ class CVManager:
         else:
             return str(data)
     
+    def replace_in_value(self, value: Any, pattern, replacement: str, path: Tuple[str, ...],
+                         fields: Optional[set], changes: List[Tuple[str, str, str]]) -> Any:
+        """Copy of value with replacements applied to in-scope strings, recording each change.
+        
+        A string's field is its own key (list indices skipped). In the skills section the
+        category names are data too: they are the `category` field and their lists `skills`.
+        """
+        if isinstance(value, dict):
+            result = {}
+            for key, item in value.items():
+                if path == ("skills",) and (fields is None or "category" in fields):
+                    renamed = pattern.sub(replacement, key)
+                    if renamed != key and renamed not in value:
+                        changes.append((f"{key} (category)", key, renamed))
+                        key = renamed
+                result[key] = self.replace_in_value(item, pattern, replacement, path + (key,), fields, changes)
+            return result
+        if isinstance(value, list):
+            return [self.replace_in_value(item, pattern, replacement, path + (str(i),), fields, changes)
+                    for i, item in enumerate(value)]
+        if path[0] == "skills":
+            field = "skills"
+        else:
+            field = next((part for part in reversed(path[1:]) if not part.isdigit()), path[0])
+        if isinstance(value, str) and (fields is None or field in fields):
+            updated = pattern.sub(replacement, value)
+            if updated != value:
+                changes.append((".".join(path[1:]), value, updated))
+            return updated
+        return value
+    
+    def replace_across_sections(self, find: str, replacement: str, regex: bool = False,
+                                fields: Optional[List[str]] = None, sections: Optional[List[str]] = None,
+                                ignore_case: bool = False, apply: bool = False) -> int:
+        """Find-and-replace over every data section: parse each file once, preview the
+        affected entries, and with apply=True write each changed file exactly once"""
+        try:
+            pattern = re.compile(find if regex else re.escape(find), re.IGNORECASE if ignore_case else 0)
+        except re.error as e:
+            print(f"✗ Invalid pattern: {e}")
+            return 0
+        if not regex:
+            # Literal mode: no backreference processing in the replacement either
+            replacement = replacement.replace('\\', '\\\\')
+        scope = set(fields) if fields else None
+        # `skills` is also a field (skill names, in the skills section and certifications)
+        section_names = sorted((scope or set()) & set(self.data_files) - {"skills"})
+        if section_names:
+            print(f"✗ --field takes a field name, not a section: {', '.join(section_names)} (use --section)")
+            return 0
+        
+        pending = {}
+        total = 0
+        for section in sections or self.data_files:
+            data = self.load_section(section)
+            changes = []
+            if isinstance(data, list):
+                updated = []
+                for i, entry in enumerate(data):
+                    entry_changes = []
+                    updated.append(self.replace_in_value(entry, pattern, replacement, (section,),
+                                                         scope, entry_changes))
+                    label = self.entry_key(section, entry) if isinstance(entry, dict) else ""
+                    changes.extend((f"#{i + 1} {label}".rstrip(), *change) for change in entry_changes)
+            else:
+                section_changes = []
+                updated = self.replace_in_value(data, pattern, replacement, (section,), scope, section_changes)
+                changes = [("", *change) for change in section_changes]
+            if not changes:
+                continue
+            
+            pending[section] = updated
+            total += len(changes)
+            print(f"\n--- {section.upper()} ({len(changes)} change(s)) ---")
+            for label, field, before, after in changes:
+                print(f"  {label} {field}".rstrip() + ":")
+                print(f"    - {before[:120]}")
+                print(f"    + {after[:120]}")
+        
+        if not pending:
+            print("No matches found.")
+            return 0
+        if not apply:
+            print(f"\n{total} change(s) in {len(pending)} file(s). Re-run with --apply to write them.")
+            return total
+        
+        for section, data in pending.items():
+            var_name, type_name = self.section_types[section]
+            self.write_ts_file(self.base_path / self.data_files[section], data, var_name, type_name)
+        print(f"\n✓ Applied {total} change(s) to {len(pending)} file(s)")
+        return total
+    
+    def print_entry(self, section: str, i: int, entry: Dict):
+        """Print one entry the way each section's "View all" shows it"""
+        if section == "experience":
+            print(f"\n{i}. {entry.get('title', 'N/A')} at {entry.get('company', 'N/A')}")
+            print(f"   Period: {entry.get('period', 'N/A')}")
+            print(f"   Location: {entry.get('location', 'N/A')}")
+            if entry.get('points'):
+                print("   Achievements:")
+                for point in entry['points'][:2]:  # Show first 2 points
+                    print(f"   • {point[:80]}...")
+        elif section == "skills":
+            print(f"\n{entry['category']}:")
+            for skill in entry['skills']:
+                print(f"  • {skill}")
+        elif section == "projects":
+            print(f"\n{i}. {entry.get('name', 'N/A')}")
+            print(f"   Slug: {entry.get('slug', 'N/A')}")
+            print(f"   Description: {entry.get('description', 'N/A')[:100]}...")
+            tech = entry.get('techStack', [])
+            if tech:
+                print(f"   Tech Stack: {', '.join(tech[:5])}{'...' if len(tech) > 5 else ''}")
+            if entry.get('github'):
+                print(f"   GitHub: {entry.get('github')}")
+            if entry.get('live'):
+                print(f"   Live: {entry.get('live')}")
+        elif section == "education":
+            print(f"\n{i}. {entry.get('degree', 'N/A')}")
+            print(f"   Institution: {entry.get('institution', 'N/A')}")
+            print(f"   Period: {entry.get('period', 'N/A')}")
+            print(f"   Location: {entry.get('location', 'N/A')}")
+            if entry.get('grade'):
+                print(f"   Grade: {entry.get('grade')}")
+            if entry.get('modules'):
+                print(f"   Key Modules: {', '.join(entry['modules'][:3])}...")
+        elif section == "certifications":
+            print(f"\n{i}. {entry.get('name', 'N/A')}")
+            print(f"   Issuer: {entry.get('issuer', 'N/A')}")
+            print(f"   Date: {entry.get('date', 'N/A')}")
+            if entry.get('expiryDate'):
+                print(f"   Expires: {entry.get('expiryDate')}")
+            if entry.get('credentialId'):
+                print(f"   Credential ID: {entry.get('credentialId')}")
+            if entry.get('verificationUrl'):
+                print(f"   Verification: {entry.get('verificationUrl')}")
+            if entry.get('skills'):
+                print(f"   Skills: {', '.join(entry['skills'][:5])}...")
+        elif section == "community":
+            print(f"\n{i}. {entry.get('title', 'N/A')}")
+            print(f"   Organization: {entry.get('organization', 'N/A')}")
+            print(f"   Location: {entry.get('location', 'N/A')}")
+            print(f"   Period: {entry.get('period', 'N/A')}")
+            if entry.get('points'):
+                print("   Activities:")
+                for point in entry['points'][:2]:  # Show first 2 points
+                    print(f"   • {point[:80]}...")
+    
+    def browse_section(self, section: str, page_size: int = 10):
+        """Paginated, filterable, sortable view of a section"""
+        filters, sort, page = {}, "position", 1
+        while True:
+            rows, total, has_more = self.list_entries(section, filters, sort, page, page_size)
+            if not rows and page == 1:
+                print(f"No {section} entries found" + (" matching the filter." if filters else "."))
+                if not filters:
+                    return
+            offset = (page - 1) * page_size
+            for i, entry in enumerate(rows, offset + 1):
+                self.print_entry(section, i, entry)
+            
+            active = ", ".join(f"{k}={v}" for k, v in filters.items()) or "none"
+            print(f"\n-- {self.page_label(page, page_size, total, has_more)} · filter: {active} · sort: {sort} --")
+            action = input("[n]ext [p]rev [f]ilter [c]lear [s]ort [q]uit: ").strip().lower()
+            if action == "n" and has_more:
+                page += 1
+            elif action == "p" and page > 1:
+                page -= 1
+            elif action == "f":
+                print(f"Filters: {', '.join(self.list_filters)} (e.g. tech=Terraform, expires=2025)")
+                key, _, value = input("Filter: ").partition("=")
+                if key.strip() in self.list_filters and value.strip():
+                    filters[key.strip()] = value.strip()
+                    page = 1
+                else:
+                    print("Invalid filter.")
+            elif action == "c":
+                filters, page = {}, 1
+            elif action == "s":
+                print(f"Sort by: {', '.join(self.list_sorts)}")
+                choice = input("Sort: ").strip()
+                if choice in self.list_sorts:
+                    sort, page = choice, 1
+            elif action in ("q", ""):
+                return
+    
+    def page_label(self, page: int, page_size: int, total: Optional[int], has_more: bool) -> str:
+        """Page position, with a total only when it was counted"""
+        if total is None:
+            return f"Page {page}{' · more available' if has_more else ' · end'}"
+        return f"Page {page}/{max(1, -(-total // page_size))} · {total} entries"
+    
     def display_menu(self):
         """Display main menu"""
         print("\n" + "="*50)
@@ -217,6 +1423,7 @@ class CVManager:
         print("7. 🌐 Community")
         print("8. 🔨 Build Website")
         print("9. 💾 Backup Data")
+        print("10. 👀 Live Preview (dev server)")
         print("0. 👋 Exit")
         print("-"*50)
     
@@ -320,19 +1527,7 @@ class CVManager:
         choice = input("\nEnter choice: ").strip()
         
         if choice == "1":
-            data = self.parse_ts_file(filepath)
-            if not data:
-                print("No experiences found.")
-                return
-                
-            for i, exp in enumerate(data, 1):
-                print(f"\n{i}. {exp.get('title', 'N/A')} at {exp.get('company', 'N/A')}")
-                print(f"   Period: {exp.get('period', 'N/A')}")
-                print(f"   Location: {exp.get('location', 'N/A')}")
-                if exp.get('points'):
-                    print("   Achievements:")
-                    for point in exp['points'][:2]:  # Show first 2 points
-                        print(f"   • {point[:80]}...")
+            self.browse_section("experience")
                         
         elif choice == "2":
             data = self.parse_ts_file(filepath)
@@ -355,8 +1550,8 @@ class CVManager:
                 points.append(point)
             new_exp['points'] = points
             
-            # Add to beginning (most recent first)
-            data.insert(0, new_exp)
+            # Keep most recent first
+            self.insert_chronologically("experience", data, new_exp)
             self.write_ts_file(filepath, data, "experience", "Experience[]")
             print("✓ Experience added successfully!")
             
@@ -471,15 +1666,7 @@ class CVManager:
         choice = input("\nEnter choice: ").strip()
         
         if choice == "1":
-            data = self.parse_ts_file(filepath)
-            if not data:
-                print("No skills found.")
-                return
-                
-            for category, skills in data.items():
-                print(f"\n{category}:")
-                for skill in skills:
-                    print(f"  • {skill}")
+            self.browse_section("skills")
                     
         elif choice == "2":
             data = self.parse_ts_file(filepath)
@@ -584,22 +1771,7 @@ class CVManager:
         choice = input("\nEnter choice: ").strip()
         
         if choice == "1":
-            data = self.parse_ts_file(filepath)
-            if not data:
-                print("No projects found.")
-                return
-                
-            for i, proj in enumerate(data, 1):
-                print(f"\n{i}. {proj.get('name', 'N/A')}")
-                print(f"   Slug: {proj.get('slug', 'N/A')}")
-                print(f"   Description: {proj.get('description', 'N/A')[:100]}...")
-                tech = proj.get('techStack', [])
-                if tech:
-                    print(f"   Tech Stack: {', '.join(tech[:5])}{'...' if len(tech) > 5 else ''}")
-                if proj.get('github'):
-                    print(f"   GitHub: {proj.get('github')}")
-                if proj.get('live'):
-                    print(f"   Live: {proj.get('live')}")
+            self.browse_section("projects")
                     
         elif choice == "2":
             data = self.parse_ts_file(filepath)
@@ -759,20 +1931,7 @@ class CVManager:
         choice = input("\nEnter choice: ").strip()
         
         if choice == "1":
-            data = self.parse_ts_file(filepath)
-            if not data:
-                print("No education entries found.")
-                return
-                
-            for i, edu in enumerate(data, 1):
-                print(f"\n{i}. {edu.get('degree', 'N/A')}")
-                print(f"   Institution: {edu.get('institution', 'N/A')}")
-                print(f"   Period: {edu.get('period', 'N/A')}")
-                print(f"   Location: {edu.get('location', 'N/A')}")
-                if edu.get('grade'):
-                    print(f"   Grade: {edu.get('grade')}")
-                if edu.get('modules'):
-                    print(f"   Key Modules: {', '.join(edu['modules'][:3])}...")
+            self.browse_section("education")
                     
         elif choice == "2":
             data = self.parse_ts_file(filepath)
@@ -800,7 +1959,7 @@ class CVManager:
             if modules:
                 new_edu['modules'] = modules
             
-            data.append(new_edu)
+            self.insert_chronologically("education", data, new_edu)
             self.write_ts_file(filepath, data, "education", "Education[]")
             print("✓ Education entry added successfully!")
             
@@ -893,23 +2052,7 @@ class CVManager:
         choice = input("\nEnter choice: ").strip()
         
         if choice == "1":
-            data = self.parse_ts_file(filepath)
-            if not data:
-                print("No certifications found.")
-                return
-                
-            for i, cert in enumerate(data, 1):
-                print(f"\n{i}. {cert.get('name', 'N/A')}")
-                print(f"   Issuer: {cert.get('issuer', 'N/A')}")
-                print(f"   Date: {cert.get('date', 'N/A')}")
-                if cert.get('expiryDate'):
-                    print(f"   Expires: {cert.get('expiryDate')}")
-                if cert.get('credentialId'):
-                    print(f"   Credential ID: {cert.get('credentialId')}")
-                if cert.get('verificationUrl'):
-                    print(f"   Verification: {cert.get('verificationUrl')}")
-                if cert.get('skills'):
-                    print(f"   Skills: {', '.join(cert['skills'][:5])}...")
+            self.browse_section("certifications")
                     
         elif choice == "2":
             data = self.parse_ts_file(filepath)
@@ -942,7 +2085,7 @@ class CVManager:
             if description:
                 new_cert['description'] = description
             
-            data.append(new_cert)
+            self.insert_chronologically("certifications", data, new_cert)
             self.write_ts_file(filepath, data, "certifications", "Certification[]")
             print("✓ Certification added successfully!")
             
@@ -1013,20 +2156,7 @@ class CVManager:
         choice = input("\nEnter choice: ").strip()
         
         if choice == "1":
-            data = self.parse_ts_file(filepath)
-            if not data:
-                print("No community involvement found.")
-                return
-                
-            for i, comm in enumerate(data, 1):
-                print(f"\n{i}. {comm.get('title', 'N/A')}")
-                print(f"   Organization: {comm.get('organization', 'N/A')}")
-                print(f"   Location: {comm.get('location', 'N/A')}")
-                print(f"   Period: {comm.get('period', 'N/A')}")
-                if comm.get('points'):
-                    print("   Activities:")
-                    for point in comm['points'][:2]:  # Show first 2 points
-                        print(f"   • {point[:80]}...")
+            self.browse_section("community")
                         
         elif choice == "2":
             data = self.parse_ts_file(filepath)
@@ -1049,7 +2179,7 @@ class CVManager:
                 points.append(point)
             new_comm['points'] = points
             
-            data.append(new_comm)
+            self.insert_chronologically("community", data, new_comm)
             self.write_ts_file(filepath, data, "community", "Community[]")
             print("✓ Community involvement added successfully!")
             
@@ -1128,30 +2258,1852 @@ class CVManager:
     
     def build_website(self):
         """Build the website"""
+        import subprocess
         print("\n--- BUILDING WEBSITE ---")
+        if self.write_derived_data():
+            print("✓ Regenerated derived.ts (data was edited outside this manager)")
         print("Running: npm run build")
         
         try:
+            usage_before = self.child_usage()
+            started = time.perf_counter()
             result = subprocess.run(
                 ["npm", "run", "build"],
-                cwd=self.base_path.parent,
+                cwd=self.root,
                 capture_output=True,
                 text=True
             )
+            wall = time.perf_counter() - started
+            record = self.record_build(result, wall, usage_before)
             
             if result.returncode == 0:
                 print("✓ Website built successfully!")
                 print("Output in: dist/")
+                self.print_build_timing(record)
+                self.stale_outputs_file.unlink(missing_ok=True)
+                self.precompress_dist()  # dist/_headers is written by `npm run build` itself
+                self.update_deploy_manifest()
                 print("\nTo preview: npm run preview")
             else:
                 print("✗ Build failed:")
                 print(result.stderr)
+            return result.returncode == 0
         except Exception as e:
             print(f"Error running build: {e}")
             print("Make sure npm is installed and you're in the correct directory.")
+            return False
+    
+    def child_usage(self, before: Optional[Dict] = None) -> Dict:
+        """CPU seconds and peak RSS of reaped child processes (delta CPU when before is given)"""
+        try:
+            import resource
+        except ImportError:  # Not available on Windows
+            return {}
+        usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        cpu = usage.ru_utime + usage.ru_stime
+        # ru_maxrss is KB on Linux, bytes on macOS
+        rss_mb = usage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+        if before:
+            cpu -= before.get("cpu", 0)
+        return {"cpu": cpu, "rssMb": rss_mb}
+    
+    def parse_build_output(self, output: str) -> Dict:
+        """Extract Astro's phase timings and per-page render times"""
+        def seconds(value: str, unit: str) -> float:
+            return float(value) / 1000 if unit == "ms" else float(value)
+        
+        phases, pages, phase = {}, {}, "build"
+        for line in re.sub(r'\x1b\[[0-9;]*m', '', output).splitlines():
+            heading = re.search(r'\[build\] (Collecting build info|Building static entrypoints|'
+                                r'Rearranging server assets)|^\s*(generating static routes|'
+                                r'building client \(vite\)|generating optimized images)\s*$', line)
+            if heading:
+                phase = heading.group(1) or heading.group(2)
+                continue
+            completed = re.search(r'Completed in ([\d.]+)(ms|s)', line)
+            if completed:
+                phases[phase] = phases.get(phase, 0) + seconds(*completed.groups())
+                continue
+            page = re.search(r'[├└]─ (\S+) \(\+([\d.]+)(ms|s)\)', line)
+            if page:
+                pages[page.group(1)] = seconds(page.group(2), page.group(3))
+                continue
+            total = re.search(r'(\d+) page\(s\) built in ([\d.]+)(ms|s)', line)
+            if total:
+                phases["total"] = seconds(total.group(2), total.group(3))
+        return {"phases": phases, "pages": pages}
+    
+    def record_build(self, result: subprocess.CompletedProcess, wall: float, usage_before: Dict) -> Dict:
+        """Append one build's timings and output size to the history file"""
+        from datetime import datetime
+        usage = self.child_usage(usage_before)
+        timings = self.parse_build_output(result.stdout + "\n" + result.stderr)
+        dist_files = [p for p in self.dist_path.rglob('*') if p.is_file()] if self.dist_path.is_dir() else []
+        pages = timings["pages"]
+        record = {
+            "timestamp": datetime.now().isoformat(timespec='seconds'),
+            "success": result.returncode == 0,
+            "wallSeconds": round(wall, 3),
+            "cpuSeconds": round(usage["cpu"], 3) if usage else None,
+            "peakRssMb": round(usage["rssMb"], 1) if usage else None,
+            "distBytes": sum(p.stat().st_size for p in dist_files),
+            "distFiles": len(dist_files),
+            "projects": len(self.load_section("projects")),
+            "phases": {name: round(value, 3) for name, value in timings["phases"].items()},
+            "pageCount": len(pages),
+            "slowestPages": sorted(pages.items(), key=lambda item: item[1], reverse=True)[:5]
+        }
+        self.state_dir.mkdir(exist_ok=True)
+        with open(self.build_history_file, 'a') as f:
+            f.write(json.dumps(record) + "\n")
+        return record
+    
+    def load_build_history(self) -> List[Dict]:
+        """All recorded builds, oldest first"""
+        if not self.build_history_file.exists():
+            return []
+        with open(self.build_history_file, 'r') as f:
+            return [json.loads(line) for line in f if line.strip()]
+    
+    def build_baseline(self, history: List[Dict], index: int) -> Optional[float]:
+        """Median wall time of the successful builds before history[index]"""
+        previous = [b["wallSeconds"] for b in history[:index] if b.get("success")]
+        window = sorted(previous[-self.build_baseline_window:])
+        if not window:
+            return None
+        middle = len(window) // 2
+        return window[middle] if len(window) % 2 else (window[middle - 1] + window[middle]) / 2
+    
+    def is_build_regression(self, wall: float, baseline: Optional[float], threshold: float) -> bool:
+        """Whether a build is more than threshold percent slower than its baseline"""
+        return baseline is not None and wall > baseline * (1 + threshold / 100)
+    
+    def print_build_timing(self, record: Dict):
+        """Timing summary for the build that just finished"""
+        history = self.load_build_history()
+        baseline = self.build_baseline(history, len(history) - 1)
+        cpu = f", CPU {record['cpuSeconds']:.1f}s" if record.get("cpuSeconds") is not None else ""
+        rss = f", peak RSS {record['peakRssMb']:.0f} MB" if record.get("peakRssMb") is not None else ""
+        print(f"⏱️  Build took {record['wallSeconds']:.1f}s{cpu}{rss}, "
+              f"dist/ {self.format_size(record['distBytes'])}")
+        for name, value in record["phases"].items():
+            print(f"   {name}: {value:.2f}s")
+        if self.is_build_regression(record["wallSeconds"], baseline, self.build_regression_threshold):
+            print(f"⚠️  {record['wallSeconds'] / baseline * 100 - 100:.0f}% slower than the "
+                  f"rolling baseline ({baseline:.1f}s)")
+    
+    def show_build_trends(self, threshold: Optional[float] = None, limit: int = 20) -> bool:
+        """Print recent builds against their rolling baseline; False if the latest regressed"""
+        threshold = self.build_regression_threshold if threshold is None else threshold
+        history = self.load_build_history()
+        if not history:
+            print("No builds recorded yet. Build the website first.")
+            return True
+        
+        print(f"\n{'When':<20} {'Wall':>7} {'CPU':>7} {'RSS':>7} {'dist/':>10} {'Pages':>5} {'Proj':>4}  Baseline")
+        latest_regressed = False
+        start = max(0, len(history) - limit)
+        for index in range(start, len(history)):
+            build = history[index]
+            baseline = self.build_baseline(history, index)
+            regressed = build.get("success") and self.is_build_regression(build["wallSeconds"], baseline, threshold)
+            cpu = f"{build['cpuSeconds']:.1f}s" if build.get("cpuSeconds") is not None else "-"
+            rss = f"{build['peakRssMb']:.0f}MB" if build.get("peakRssMb") is not None else "-"
+            note = "failed" if not build.get("success") else (
+                f"{baseline:.1f}s" + (f"  ⚠️ +{build['wallSeconds'] / baseline * 100 - 100:.0f}%" if regressed else "")
+                if baseline else "-")
+            print(f"{build['timestamp']:<20} {build['wallSeconds']:>6.1f}s {cpu:>7} {rss:>7} "
+                  f"{self.format_size(build['distBytes']):>10} {build['pageCount']:>5} "
+                  f"{build.get('projects', 0):>4}  {note}")
+            latest_regressed = bool(regressed) if index == len(history) - 1 else latest_regressed
+        
+        slowest = history[-1].get("slowestPages")
+        if slowest:
+            print("\nSlowest pages in the latest build:")
+            for page, seconds in slowest:
+                print(f"  {seconds * 1000:>7.0f}ms  {page}")
+        return not latest_regressed
+    
+    def time_startup(self, args: List[str]) -> Tuple[float, float]:
+        """Seconds from launch to the first output (the menu prompt without args) and to exit"""
+        import subprocess
+        start = time.perf_counter()
+        process = subprocess.Popen([sys.executable, "-u", "-m", "cv_manager", *args], cwd=self.root,
+                                   stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        if args:
+            process.stdin.close()
+        output, first = b"", None
+        while chunk := os.read(process.stdout.fileno(), 65536):
+            output += chunk
+            if first is None and (b"Enter your choice" in output or args):
+                first = time.perf_counter() - start
+                if not args:
+                    process.stdin.write(b"0\n")
+                    process.stdin.close()
+        process.wait()
+        total = time.perf_counter() - start
+        return (first or total), total
+    
+    def interpreter_startup(self) -> float:
+        """Seconds for a bare `python3 -c pass`, the unit startup budgets are measured in"""
+        import subprocess
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], stdin=subprocess.DEVNULL)
+        return time.perf_counter() - start
+    
+    def import_profile(self, args: List[str]) -> List[Tuple[str, int, float]]:
+        """(module, nesting level, cumulative seconds) for every import of one run under -X importtime"""
+        import subprocess
+        result = subprocess.run([sys.executable, "-X", "importtime", "-m", "cv_manager", *args], cwd=self.root,
+                                input="" if args else "0\n", capture_output=True, text=True)
+        imports = []
+        for line in result.stderr.splitlines():
+            match = re.match(r'import time:\s+\d+ \|\s+(\d+) \| ( *)(\S+)', line)
+            if match:
+                imports.append((match.group(3), len(match.group(2)) // 2, int(match.group(1)) / 1e6))
+        return imports
+    
+    def benchmark_startup(self, runs: int = 5, budgets: Optional[Dict[str, float]] = None) -> bool:
+        """Time the menu and quick one-shot commands against their startup budgets; False if any
+        is over budget or the menu imports a module that should be deferred"""
+        import statistics
+        if sys.flags.dont_write_bytecode or os.environ.get("PYTHONDONTWRITEBYTECODE"):
+            print("⚠️  Bytecode caching is disabled, so timings include compiling cv_manager.py")
+        self.time_startup(["--help"])  # Warm-up: writes __pycache__ and warms the file cache
+        baseline = statistics.median(self.interpreter_startup() for _ in range(runs))
+        
+        print(f"\nStartup, median of {runs} runs of python3 -m cv_manager (as ./manage-cv runs it)")
+        print(f"Bare interpreter start: {baseline * 1000:.0f}ms; budgets are multiples of it")
+        print(f"{'Command':<10} {'First output':>12} {'Exit':>8} {'Imports':>8} {'Budget':>8}  Slowest imports")
+        within_budget = True
+        for name, multiple in {**self.startup_budgets, **(budgets or {})}.items():
+            budget = multiple * baseline
+            args = [] if name == "menu" else name.split()
+            timings = [self.time_startup(args) for _ in range(runs)]
+            first = statistics.median(timing[0] for timing in timings)
+            total = statistics.median(timing[1] for timing in timings)
+            imports = self.import_profile(args)
+            top_level = sorted(((seconds, module) for module, level, seconds in imports if level == 0), reverse=True)
+            slowest = ", ".join(f"{module} {seconds * 1000:.0f}ms" for seconds, module in top_level[:3])
+            status = "✓" if first <= budget else "✗"
+            within_budget = within_budget and first <= budget
+            print(f"{name:<10} {first * 1000:>10.0f}ms {total * 1000:>6.0f}ms "
+                  f"{sum(seconds for seconds, _ in top_level) * 1000:>6.0f}ms {budget * 1000:>6.0f}ms {status} {slowest}")
+            
+            if name == "menu":
+                eager = sorted({module for module, _, _ in imports} & set(self.startup_deferred_modules))
+                if eager:
+                    print(f"  ✗ Imported before the menu (defer into the functions that use them): {', '.join(eager)}")
+                    within_budget = False
+        
+        print("\n✓ Startup within budget" if within_budget else "\n✗ Startup over budget")
+        return within_budget
+    
+    @property
+    def dev_server_url(self) -> str:
+        return f"http://{self.dev_host}:{self.dev_port}/"
+    
+    def dev_server_healthy(self, timeout: float = 1.0) -> bool:
+        """Whether something is answering HTTP on the dev server port"""
+        import urllib.error
+        import urllib.request
+        try:
+            with urllib.request.urlopen(self.dev_server_url, timeout=timeout) as response:
+                return response.status < 500
+        except urllib.error.HTTPError as e:
+            return e.code < 500
+        except (OSError, ValueError):
+            return False
+    
+    def start_dev_server(self, wait: float = 60.0) -> bool:
+        """Start `astro dev` in the background, or adopt one already listening on the port"""
+        import subprocess
+        if self.dev_server is not None and self.dev_server.poll() is None:
+            return True
+        if self.dev_server_healthy():
+            print(f"✓ Reusing dev server already running at {self.dev_server_url}")
+            return True
+        
+        self.state_dir.mkdir(exist_ok=True)
+        log = open(self.dev_log_file, 'w')
+        print(f"Starting astro dev on {self.dev_server_url} (log: {self.dev_log_file})")
+        try:
+            self.dev_server = subprocess.Popen(
+                ["npx", "astro", "dev", "--host", self.dev_host, "--port", str(self.dev_port)],
+                cwd=self.root,
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                start_new_session=(os.name == "posix")  # Own process group for clean shutdown
+            )
+        except OSError as e:
+            log.close()
+            print(f"✗ Could not start dev server: {e}")
+            return False
+        finally:
+            log.close()
+        
+        deadline = time.monotonic() + wait
+        while time.monotonic() < deadline:
+            if self.dev_server.poll() is not None:
+                print(f"✗ Dev server exited with code {self.dev_server.returncode}:")
+                print(self.dev_log_file.read_text()[-2000:])
+                self.dev_server = None
+                return False
+            if self.dev_server_healthy():
+                print(f"✓ Dev server ready at {self.dev_server_url}")
+                return True
+            time.sleep(0.25)
+        
+        print(f"✗ Dev server did not become healthy within {wait:.0f}s")
+        self.stop_dev_server()
+        return False
+    
+    def ensure_dev_server(self) -> bool:
+        """Restart the managed dev server if it has died"""
+        if self.dev_server is not None and self.dev_server.poll() is not None:
+            print(f"⚠️  Dev server exited (code {self.dev_server.returncode}); restarting")
+            self.dev_server = None
+            return self.start_dev_server()
+        return True
+    
+    def stop_dev_server(self):
+        """Stop the managed dev server and its children (servers we adopted are left alone)"""
+        process, self.dev_server = self.dev_server, None
+        if process is None or process.poll() is not None:
+            return
+        import signal
+        import subprocess
+        
+        def send(sig):
+            try:
+                if os.name == "posix":
+                    os.killpg(process.pid, sig)
+                elif sig == signal.SIGTERM:
+                    process.terminate()
+                else:
+                    process.kill()
+            except ProcessLookupError:
+                pass
+        
+        send(signal.SIGTERM)
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            send(signal.SIGKILL)
+            process.wait()
+        print("✓ Dev server stopped")
+    
+    def start_validator(self) -> bool:
+        """Start the schema validation worker unless it is running or known not to work"""
+        import queue
+        import shutil
+        import subprocess
+        import threading
+        if self.validator is not None and self.validator.poll() is None:
+            return True
+        mtime = self.schemas_file.stat().st_mtime_ns if self.schemas_file.exists() else None
+        if self._validator_unavailable and self._validator_unavailable[1] == mtime:
+            return False
+        
+        node = shutil.which("node")
+        reason = None
+        if mtime is None:
+            reason = f"{self.schemas_file.name} not found"
+        elif not node:
+            reason = "node not found"
+        elif not (self.root / "node_modules" / "zod").is_dir():
+            reason = "zod is not installed (run npm install)"
+        else:
+            try:
+                process = subprocess.Popen([node, str(self.validator_script)], cwd=self.root,
+                                           stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                           stderr=subprocess.DEVNULL, text=True, encoding='utf-8', bufsize=1)
+            except OSError as e:
+                reason = str(e)
+        if reason is None:
+            # Replies are read on a thread so every wait can time out
+            replies = queue.Queue()
+            def pump():
+                for line in process.stdout:
+                    replies.put(line)
+                replies.put(None)
+            threading.Thread(target=pump, daemon=True).start()
+            self.validator, self._validator_replies, self._validator_mtime = process, replies, mtime
+            ready = self.validator_reply()
+            if ready and ready.get("ready"):
+                return True
+            reason = (ready or {}).get("error", "worker did not start")
+            self.stop_validator()
+        
+        self._validator_unavailable = (reason, mtime)
+        print(f"⚠️  Schema validation unavailable: {reason}")
+        return False
+    
+    def validator_reply(self) -> Optional[Dict]:
+        """Next message from the validation worker; None if it exited or timed out"""
+        import queue
+        try:
+            line = self._validator_replies.get(timeout=self.validator_timeout)
+        except queue.Empty:
+            return None
+        return json.loads(line) if line else None
+    
+    def stop_validator(self):
+        """Stop the validation worker (it also exits on its own when stdin closes)"""
+        process, self.validator = self.validator, None
+        if process is None:
+            return
+        import subprocess
+        try:
+            process.stdin.close()
+            process.wait(timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+            process.wait()
+    
+    def validate_with_schema(self, data: Optional[Dict] = None) -> Optional[Tuple[List[Dict], float]]:
+        """Validate CV data (default: every section as saved) against CVDataSchema in the worker.
+        Returns zod's issues and the worker's time in ms, or None if validation is unavailable."""
+        if self.validator is not None:
+            if self.validator.poll() is not None:
+                self.stop_validator()
+            elif self.schemas_file.stat().st_mtime_ns != self._validator_mtime:
+                print(f"↻ {self.schemas_file.name} changed; restarting schema validator")
+                self.stop_validator()
+        if not self.start_validator():
+            return None
+        
+        if data is None:
+            data = {section: self.load_section(section) for section in self.data_files}
+        self._validator_requests += 1
+        request_id = self._validator_requests
+        try:
+            self.validator.stdin.write(json.dumps({"id": request_id, "data": data}, ensure_ascii=False) + "\n")
+            self.validator.stdin.flush()
+        except OSError:
+            reply = None
+        else:
+            reply = self.validator_reply()
+        if not reply or reply.get("id") != request_id or "issues" not in reply:
+            print(f"⚠️  Schema validator failed{': ' + reply['error'] if reply and reply.get('error') else ''}")
+            self.stop_validator()
+            return None
+        return reply["issues"], reply["ms"]
+    
+    def check_pending_section(self, section: str, data: Any):
+        """Validate a section's new data, with the other sections as saved, before it is written"""
+        document = {name: data if name == section else self.load_section(name) for name in self.data_files}
+        result = self.validate_with_schema(document)
+        if result is None:
+            return
+        self.report_schema_issues(*result)
+        if result[0]:
+            print("⚠️  Saving anyway; the dev build rejects the data until these are fixed")
+    
+    def report_schema_issues(self, issues: List[Dict], ms: float, limit: int = 10):
+        """Print zod issues as section[index].field paths"""
+        if not issues:
+            print(f"✓ Schema valid ({ms:.1f}ms)")
+            return
+        print(f"✗ Schema: {len(issues)} issue(s) ({ms:.1f}ms)")
+        for issue in issues[:limit]:
+            path = "".join(f"[{part}]" if isinstance(part, int) else f".{part}" for part in issue["path"])
+            print(f"  {path.lstrip('.') or '(root)'}: {issue['message']}")
+        if len(issues) > limit:
+            print(f"  ... and {len(issues) - limit} more")
+    
+    def manage_preview(self):
+        """Start, check or stop the live preview server"""
+        running = self.dev_server is not None and self.dev_server.poll() is None
+        print("\n--- LIVE PREVIEW ---")
+        print(f"Status: {'running at ' + self.dev_server_url if running else 'stopped'}")
+        print("1. Start / check preview server")
+        print("2. Stop preview server")
+        print("3. Serve built dist/ (production-like)")
+        print("4. Back to main menu")
+        
+        choice = input("\nEnter choice: ").strip()
+        if choice == "1":
+            if self.start_dev_server() and self.ensure_dev_server():
+                print("Edits made in this session appear in the browser without a rebuild.")
+        elif choice == "2":
+            if running:
+                self.stop_dev_server()
+            else:
+                print("No managed preview server is running.")
+        elif choice == "3":
+            self.serve_dist()
+    
+    def json_resume(self, sections: Dict[str, Any]) -> Dict:
+        """The CV in JSON Resume schema (https://jsonresume.org/schema); list sections may be iterators"""
+        def dates(entry: Dict) -> Dict[str, str]:
+            period = self.entry_period(entry)
+            if not period:
+                return {}
+            start, end = period
+            result = {"startDate": self.format_month(start)}
+            if end is not None:
+                result["endDate"] = self.format_month(end)
+            return result
+        
+        personal = sections["personal"]
+        contact = personal.get("contact", {})
+        profiles = [{"network": network, "url": contact[key]}
+                    for key, network in (("linkedin", "LinkedIn"), ("github", "GitHub")) if contact.get(key)]
+        basics = {"name": personal.get("name", ""), "label": personal.get("title", ""),
+                  "email": contact.get("email", ""), "phone": contact.get("phone", ""),
+                  "url": contact.get("website", ""), "summary": personal.get("summary", ""),
+                  "location": {"address": contact.get("location", "")}, "profiles": profiles}
+        return {
+            "$schema": "https://raw.githubusercontent.com/jsonresume/resume-schema/v1.0.0/schema.json",
+            "basics": basics,
+            "work": [{"name": e.get("company", ""), "position": e.get("title", ""), "location": e.get("location", ""),
+                      **dates(e), "highlights": e.get("points", [])} for e in sections["experience"]],
+            "volunteer": [{"organization": e.get("organization", ""), "position": e.get("title", ""),
+                           **dates(e), "highlights": e.get("points", [])} for e in sections["community"]],
+            "education": [{"institution": e.get("institution", ""), "area": e.get("degree", ""), **dates(e),
+                           "score": e.get("grade", ""), "courses": e.get("modules", [])}
+                          for e in sections["education"]],
+            "certificates": [{"name": e.get("name", ""), "issuer": e.get("issuer", ""),
+                              "date": dates(e).get("startDate", e.get("date", "")),
+                              "url": e.get("verificationUrl", "")} for e in sections["certifications"]],
+            "skills": [{"name": category, "keywords": skills} for category, skills in sections["skills"].items()],
+            "projects": [{"name": e.get("name", ""), "description": e.get("description", ""),
+                          "highlights": e.get("achievements", []), "keywords": e.get("techStack", []),
+                          "url": self.project_link(e.get("live") or e.get("github", ""))} for e in sections["projects"]]
+        }
+    
+    def export_cv(self, formats: Optional[List[str]] = None, out_dir: Optional[Path] = None) -> Dict[str, Path]:
+        """Render the requested formats in parallel, streaming list sections entry by entry"""
+        from concurrent.futures import ProcessPoolExecutor
+        formats = formats or list(self.export_formats)
+        out_dir = out_dir or self.export_dir
+        out_dir.mkdir(parents=True, exist_ok=True)
+        started = time.perf_counter()
+        personal, skills = self.load_section("personal"), self.load_section("skills")
+        targets = {fmt: out_dir / f"cv.{fmt}" for fmt in formats}
+        results = {}
+        
+        # Templated formats are CPU-bound string work, so they get their own processes;
+        # JSON Resume is written here meanwhile
+        templated = [fmt for fmt in formats if fmt in self.export_templates]
+        with ProcessPoolExecutor(max_workers=max(1, len(templated))) as pool:
+            futures = {fmt: pool.submit(render_cv_export, {"format": fmt, "personal": personal, "skills": skills,
+                                                          "target": str(targets[fmt]),
+                                                          "headings": self.export_sections})
+                       for fmt in templated}
+            if "json" in targets:
+                began = time.perf_counter()
+                with open(targets["json"], 'w', encoding='utf-8') as f:
+                    sections = {section: self.iter_section_entries(section) for section in self.data_files}
+                    sections.update(personal=personal, skills=skills)
+                    json.dump(self.json_resume(sections), f, indent=2, ensure_ascii=False)
+                results["json"] = (targets["json"].stat().st_size, time.perf_counter() - began)
+            for fmt, future in futures.items():
+                results[fmt] = future.result()
+        
+        for fmt in formats:
+            size, seconds = results[fmt]
+            print(f"✓ {targets[fmt].name:<10} {self.format_size(size):>10} {seconds * 1000:7.1f}ms")
+        print(f"✓ Exported {len(formats)} format(s) to {out_dir} in {(time.perf_counter() - started) * 1000:.0f}ms")
+        return targets
+    
+    def header_rule_pattern(self, path: str):
+        """Compile a Netlify header path: `*` is a splat, `:name` a placeholder segment"""
+        pattern = re.escape(path).replace(r'\*', '.*')
+        pattern = re.sub(r':\w+', '[^/]+', pattern)
+        return re.compile(f"^{pattern}/?$")
+    
+    def load_header_rules(self) -> List[Tuple[Any, Dict[str, str]]]:
+        """Header rules from dist/_headers and netlify.toml [[headers]] as (compiled pattern, headers)"""
+        rules = []
+        if self.headers_file.exists():
+            current = None
+            for line in self.headers_file.read_text().splitlines():
+                if not line.strip() or line.lstrip().startswith('#'):
+                    continue
+                if not line[0].isspace():
+                    current = {}
+                    rules.append((self.header_rule_pattern(line.strip()), current))
+                elif current is not None and ':' in line:
+                    name, value = line.split(':', 1)
+                    current[name.strip()] = value.strip()
+        
+        try:
+            import tomllib
+        except ImportError:  # Python < 3.11
+            print("⚠️  tomllib unavailable (Python 3.11+); netlify.toml headers not applied")
+            return rules
+        if not self.netlify_config.exists():
+            return rules
+        with open(self.netlify_config, 'rb') as f:
+            config = tomllib.load(f)
+        for rule in config.get("headers", []):
+            rules.append((self.header_rule_pattern(rule["for"]), rule.get("values", {})))
+        return rules
+    
+    def serve_dist(self, port: Optional[int] = None, host: str = "127.0.0.1"):
+        """Serve dist/ the way production does: precompressed variants, validators,
+        conditional 304s, netlify.toml headers and zero-copy sends for large files"""
+        import email.utils
+        import mimetypes
+        import urllib.parse
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        
+        if not self.dist_path.is_dir():
+            print("No dist/ directory found. Build the website first.")
+            return
+        
+        dist = self.dist_path.resolve()
+        header_rules = self.load_header_rules()
+        etags = {}  # (path, mtime_ns, size) -> ETag, shared by handler threads
+        manager = self
+        sendfile_threshold = 64 * 1024
+        
+        class PreviewHandler(BaseHTTPRequestHandler):
+            server_version = "CVPreview"
+            protocol_version = "HTTP/1.1"
+            
+            def resolve(self, url_path: str) -> Optional[Path]:
+                """Map a URL to a file, following Netlify's pretty-URL rules"""
+                relative = urllib.parse.unquote(url_path).lstrip('/')
+                candidate = (dist / relative).resolve()
+                if candidate != dist and dist not in candidate.parents:
+                    return None  # Path traversal
+                for option in (candidate, candidate / "index.html", candidate.with_name(candidate.name + ".html")):
+                    if option.is_file():
+                        return option
+                return None
+            
+            def etag(self, path: Path, stat) -> str:
+                key = (str(path), stat.st_mtime_ns, stat.st_size)
+                if key not in etags:
+                    etags[key] = f'"{manager.hash_file(path)[:20]}"'
+                return etags[key]
+            
+            def not_modified(self, etag: str, mtime: float) -> bool:
+                if_none_match = self.headers.get("If-None-Match")
+                if if_none_match:
+                    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+                    return "*" in tags or etag in tags
+                if_modified_since = self.headers.get("If-Modified-Since")
+                if if_modified_since:
+                    try:
+                        since = email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+                    except (TypeError, ValueError):
+                        return False
+                    return int(mtime) <= since
+                return False
+            
+            def do_HEAD(self):
+                self.handle_request(send_body=False)
+            
+            def do_GET(self):
+                self.handle_request(send_body=True)
+            
+            def handle_request(self, send_body: bool):
+                started = time.perf_counter()
+                url_path = urllib.parse.urlsplit(self.path).path
+                path = self.resolve(url_path)
+                status = 200
+                if path is None:
+                    status = 404
+                    path = dist / "404.html" if (dist / "404.html").is_file() else None
+                
+                headers = {}
+                for pattern, values in header_rules:
+                    if pattern.match(url_path):
+                        for name, value in values.items():
+                            headers.setdefault(name, value)  # First matching rule wins
+                headers.setdefault("Cache-Control", "public, max-age=0, must-revalidate")
+                
+                if path is None:
+                    body = b"Not Found"
+                    self.send_response(404)
+                    self.send_header("Content-Type", "text/plain; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    if send_body:
+                        self.wfile.write(body)
+                    self.log_timing(404, len(body) if send_body else 0, "-", started)
+                    return
+                
+                # Prefer a precompressed sibling the client accepts
+                accepted = self.headers.get("Accept-Encoding", "")
+                served, encoding = path, None
+                for suffix, name in (("br", "br"), ("gz", "gzip")):
+                    sibling = path.with_name(f"{path.name}.{suffix}")
+                    if re.search(rf'\b{name}\b', accepted) and sibling.is_file():
+                        served, encoding = sibling, name
+                        break
+                
+                stat = served.stat()
+                etag = self.etag(served, stat)
+                content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+                if content_type.startswith("text/") or content_type in ("application/json", "application/xml"):
+                    content_type += "; charset=utf-8"
+                headers.update({
+                    "Content-Type": content_type,
+                    "ETag": etag,
+                    "Last-Modified": email.utils.formatdate(stat.st_mtime, usegmt=True),
+                    "Vary": "Accept-Encoding"
+                })
+                if encoding:
+                    headers["Content-Encoding"] = encoding
+                
+                if status == 200 and self.not_modified(etag, stat.st_mtime):
+                    self.send_response(304)
+                    for name in ("ETag", "Last-Modified", "Cache-Control", "Vary"):
+                        self.send_header(name, headers[name])
+                    self.end_headers()
+                    self.log_timing(304, 0, encoding or "identity", started)
+                    return
+                
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(stat.st_size))
+                self.end_headers()
+                sent = 0
+                if send_body:
+                    with open(served, 'rb') as f:
+                        if stat.st_size >= sendfile_threshold:
+                            self.wfile.flush()
+                            sent = self.connection.sendfile(f)  # os.sendfile where supported
+                        else:
+                            self.wfile.write(f.read())
+                            sent = stat.st_size
+                self.log_timing(status, sent, encoding or "identity", started)
+            
+            def log_timing(self, status: int, sent: int, encoding: str, started: float):
+                elapsed = (time.perf_counter() - started) * 1000
+                print(f"{self.command:<4} {status} {elapsed:7.2f}ms {manager.format_size(sent):>10} "
+                      f"{encoding:<8} {self.path}")
+            
+            def log_message(self, format, *args):
+                pass  # Replaced by log_timing
+        
+        port = port or self.serve_port
+        server = ThreadingHTTPServer((host, port), PreviewHandler)
+        print(f"\n🌐 Serving {self.dist_path} at http://{host}:{port}/ (Ctrl+C to stop)")
+        print(f"{'Verb':<4} {'Code'} {'Latency':>9} {'Bytes':>10} {'Encoding':<8} Path")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\n✓ Server stopped")
+        finally:
+            server.server_close()
+    
+    def format_size(self, size: int) -> str:
+        """Human readable byte count"""
+        for unit in ("B", "KB", "MB"):
+            if abs(size) < 1024:
+                return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+            size /= 1024
+        return f"{size:.1f} GB"
+    
+    def hash_file(self, filepath: Path, chunk_size: int = 1 << 20) -> str:
+        """SHA-256 of a file, streamed in chunks so large assets stay out of memory"""
+        import hashlib
+        digest = hashlib.sha256()
+        with open(filepath, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    def build_dist_manifest(self) -> Dict[str, Dict]:
+        """Hash every file in dist/ in parallel (hashlib releases the GIL on large buffers)"""
+        from concurrent.futures import ThreadPoolExecutor
+        files = sorted(p for p in self.dist_path.rglob('*') if p.is_file())
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) + 4)) as pool:
+            hashes = pool.map(self.hash_file, files)
+        return {
+            path.relative_to(self.dist_path).as_posix(): {"hash": digest, "size": path.stat().st_size}
+            for path, digest in zip(files, hashes)
+        }
+    
+    def diff_manifests(self, old: Dict[str, Dict], new: Dict[str, Dict]) -> Dict[str, List[Dict]]:
+        """Minimal changeset between two manifests"""
+        changeset = {"added": [], "modified": [], "removed": []}
+        for path, entry in new.items():
+            if path not in old:
+                changeset["added"].append({"path": path, "size": entry["size"]})
+            elif old[path]["hash"] != entry["hash"]:
+                changeset["modified"].append({"path": path, "size": entry["size"],
+                                              "previousSize": old[path]["size"]})
+        for path, entry in old.items():
+            if path not in new:
+                changeset["removed"].append({"path": path, "size": entry["size"]})
+        return changeset
+    
+    def print_changeset(self, changeset: Dict[str, List[Dict]], total_files: int):
+        """Per-build summary of what a deploy would have to upload"""
+        for kind in ("added", "modified", "removed"):
+            entries = changeset[kind]
+            size = sum(entry["size"] for entry in entries)
+            print(f"  {kind.capitalize():<9} {len(entries):>4} files  {self.format_size(size):>10}")
+        changed = len(changeset["added"]) + len(changeset["modified"])
+        print(f"  Unchanged {total_files - changed:>4} files")
+    
+    def precompress_dist(self) -> Optional[Dict[str, Dict[str, int]]]:
+        """Write .gz/.br siblings for compressible dist/ files, reusing cached output by content hash"""
+        import shutil
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+        if not self.dist_path.is_dir():
+            print("No dist/ directory found. Build the website first.")
+            return None
+        
+        files = sorted(p for p in self.dist_path.rglob('*')
+                       if p.is_file() and p.suffix.lower() in self.compressible_types)
+        self.compress_cache_dir.mkdir(parents=True, exist_ok=True)
+        encoders = ["gz"]
+        try:
+            import brotli  # noqa: F401 - optional
+            encoders.append("br")
+        except ImportError:
+            pass
+        
+        # Cached output is only valid for the encoders it was produced with
+        index_file = self.compress_cache_dir / "index.json"
+        cache = json.loads(index_file.read_text()) if index_file.exists() else {}
+        index = cache.get("entries", {}) if cache.get("encoders") == encoders else {}
+        
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) + 4)) as pool:
+            hashes = list(pool.map(self.hash_file, files))
+        
+        jobs = [{"path": str(path), "hash": digest, "encoders": encoders,
+                 "cache_dir": str(self.compress_cache_dir)}
+                for path, digest in zip(files, hashes)
+                if digest not in index or not all((self.compress_cache_dir / f"{digest}.{suffix}").exists()
+                                                  for suffix in index[digest])]
+        if jobs:
+            with ProcessPoolExecutor(max_workers=os.cpu_count() or 1) as pool:
+                for job, sizes in zip(jobs, pool.map(compress_asset, jobs, chunksize=4)):
+                    index[job["hash"]] = sizes
+        
+        report = {}
+        for path, digest in zip(files, hashes):
+            for suffix in ("gz", "br"):
+                sibling = path.with_name(path.name + f".{suffix}")
+                if suffix in index[digest]:
+                    shutil.copyfile(self.compress_cache_dir / f"{digest}.{suffix}", sibling)
+                elif sibling.exists():
+                    sibling.unlink()  # Stale sibling from an earlier build
+            stats = report.setdefault(path.suffix.lower(), {"files": 0, "raw": 0, "gz": 0, "br": 0})
+            raw = path.stat().st_size
+            stats["files"] += 1
+            stats["raw"] += raw
+            for suffix in ("gz", "br"):
+                stats[suffix] += index[digest].get(suffix, raw)
+        
+        # Forget cached output for content no longer in dist/
+        for digest in set(index) - set(hashes):
+            for suffix in index.pop(digest):
+                (self.compress_cache_dir / f"{digest}.{suffix}").unlink(missing_ok=True)
+        index_file.write_text(json.dumps({"encoders": encoders, "entries": index}))
+        
+        has_brotli = "br" in encoders
+        print(f"\n🗜️  Precompressed {len(files)} files ({len(jobs)} compressed, "
+              f"{len(files) - len(jobs)} from cache){'' if has_brotli else ' - brotli module not installed, gzip only'}")
+        print(f"  {'Type':<8} {'Files':>5} {'Raw':>10} {'Gzip saved':>12}" + (f" {'Brotli saved':>13}" if has_brotli else ""))
+        for ext, stats in sorted(report.items()):
+            line = f"  {ext:<8} {stats['files']:>5} {self.format_size(stats['raw']):>10} " \
+                   f"{self.format_size(stats['raw'] - stats['gz']):>12}"
+            if has_brotli:
+                line += f" {self.format_size(stats['raw'] - stats['br']):>13}"
+            print(line)
+        return report
+    
+    def classify_dist_file(self, relative: str) -> str:
+        """Cache tier of a dist/ file: fingerprinted, stable, volatile (pages) or volatile-data"""
+        name = relative.rsplit('/', 1)[-1]
+        if relative.startswith(self.fingerprinted_dirs) or self.fingerprint_pattern.search(name):
+            return "fingerprinted"
+        if name.endswith(".html"):
+            return "volatile"
+        if name.endswith((".json", ".xml", ".txt", ".webmanifest")):
+            return "volatile-data"
+        return "stable"
+    
+    def write_cache_headers(self) -> Optional[Dict[str, int]]:
+        """Generate dist/_headers with Cache-Control per file tier. Directories whose files all
+        share a tier get one glob rule; rules never overlap, as Netlify merges every match."""
+        if not self.dist_path.is_dir():
+            print("No dist/ directory found. Build the website first.")
+            return None
+        
+        tiers = {}
+        for path in sorted(self.dist_path.rglob('*')):
+            if not path.is_file() or path == self.headers_file or path.name == "_redirects":
+                continue
+            relative = path.relative_to(self.dist_path).as_posix()
+            if path.suffix in (".gz", ".br") and path.with_suffix("").exists():
+                continue  # Precompressed siblings follow their source file
+            tiers[relative] = self.classify_dist_file(relative)
+        
+        def url(relative: str) -> str:
+            if relative == "index.html":
+                return "/"
+            if relative.endswith("/index.html"):
+                return "/" + relative[:-len("/index.html")]
+            return "/" + relative[:-len(".html")] if relative.endswith(".html") else "/" + relative
+        
+        # Collapse to the shallowest directories whose files all share one tier
+        rules, covered = [], set()
+        for relative in tiers:
+            parts = relative.split('/')
+            for depth in range(1, len(parts)):
+                directory = "/".join(parts[:depth]) + "/"
+                members = [key for key in tiers if key.startswith(directory)]
+                # A directory's own index page is served at /dir, which /dir/* would not match
+                if (directory not in covered and f"{directory}index.html" not in tiers
+                        and len({tiers[key] for key in members}) == 1):
+                    rules.append((f"/{directory}*", tiers[relative]))
+                    covered.add(directory)
+                if directory in covered:
+                    break
+            else:
+                rules.append((url(relative), tiers[relative]))
+        
+        lines = ["# Generated by cv_manager.py after each build - do not edit by hand."]
+        for pattern, tier in rules:
+            lines += [pattern, f"  Cache-Control: {self.cache_policies[tier]}"]
+        content = "\n".join(lines) + "\n"
+        if not self.headers_file.exists() or self.headers_file.read_text() != content:
+            self.headers_file.write_text(content)
+        
+        counts = {}
+        for tier in tiers.values():
+            counts[tier] = counts.get(tier, 0) + 1
+        print(f"✓ Wrote {self.headers_file.name}: {len(rules)} rules for "
+              + ", ".join(f"{count} {tier}" for tier, count in sorted(counts.items())))
+        return counts
+    
+    def load_page_budgets(self) -> Tuple[Dict[str, int], Dict[str, Dict[str, int]]]:
+        """Default budgets plus per-page overrides keyed by URL glob"""
+        budgets, overrides = dict(self.default_page_budgets), {}
+        if self.page_budgets_file.exists():
+            with open(self.page_budgets_file, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+            budgets.update(config.get("default", {}))
+            overrides = config.get("pages", {})
+        return budgets, overrides
+    
+    def page_url(self, page: Path) -> str:
+        """URL a dist/ file is served at (pretty URLs for index.html)"""
+        relative = page.relative_to(self.dist_path).as_posix()
+        if relative == "index.html":
+            return "/"
+        if relative.endswith("/index.html"):
+            return "/" + relative[:-len("index.html")]
+        return "/" + relative
+    
+    def page_assets(self, page: Path) -> Dict[str, List[Path]]:
+        """Stylesheets, scripts and images a page references, resolved to dist/ files"""
+        import urllib.parse
+        from html.parser import HTMLParser
+        
+        refs = {"css": [], "js": [], "images": []}
+        
+        def largest_candidate(srcset: str) -> Optional[str]:
+            # Budget for the biggest candidate a high-density screen may pick
+            best, best_width = None, -1
+            for candidate in srcset.split(","):
+                parts = candidate.split()
+                if not parts:
+                    continue
+                width = int(parts[1][:-1]) if len(parts) > 1 and parts[1][:-1].isdigit() else 0
+                if width > best_width:
+                    best, best_width = parts[0], width
+            return best
+        
+        class AssetCollector(HTMLParser):
+            picture_chosen = None  # None outside <picture>, else whether a source was taken
+            
+            def handle_starttag(self, tag, attrs):
+                attrs = dict(attrs)
+                rel = (attrs.get("rel") or "").lower().split()
+                if tag == "link" and "stylesheet" in rel and attrs.get("href"):
+                    refs["css"].append(attrs["href"])
+                elif tag == "link" and "modulepreload" in rel and attrs.get("href"):
+                    refs["js"].append(attrs["href"])
+                elif tag == "script" and attrs.get("src"):
+                    refs["js"].append(attrs["src"])
+                elif tag == "picture":
+                    self.picture_chosen = False
+                elif tag == "source" and self.picture_chosen is False and attrs.get("srcset"):
+                    # Browsers take the first <source> whose type they support
+                    refs["images"].append(largest_candidate(attrs["srcset"]))
+                    self.picture_chosen = True
+                elif tag == "img" and not self.picture_chosen:
+                    src = largest_candidate(attrs["srcset"]) if attrs.get("srcset") else attrs.get("src")
+                    if src:
+                        refs["images"].append(src)
+            
+            def handle_endtag(self, tag):
+                if tag == "picture":
+                    self.picture_chosen = None
+        
+        AssetCollector().feed(page.read_text(encoding='utf-8', errors='replace'))
+        
+        base_url = self.page_url(page)
+        resolved = {}
+        for kind, urls in refs.items():
+            paths = []
+            for url in urls:
+                parts = urllib.parse.urlsplit(urllib.parse.urljoin(base_url, url))
+                if parts.scheme or parts.netloc:
+                    continue  # Third-party assets are out of our hands
+                path = self.dist_path / urllib.parse.unquote(parts.path).lstrip('/')
+                if path.is_file() and path not in paths:
+                    paths.append(path)
+            resolved[kind] = paths
+        return resolved
+    
+    def compressed_size(self, filepath: Path) -> int:
+        """Bytes on the wire: the .gz sibling if present, else gzip -9 of compressible types"""
+        sibling = filepath.with_name(filepath.name + ".gz")
+        if sibling.exists():
+            return sibling.stat().st_size
+        if filepath.suffix.lower() not in self.compressible_types:
+            return filepath.stat().st_size
+        import gzip
+        return min(len(gzip.compress(filepath.read_bytes(), compresslevel=9)), filepath.stat().st_size)
+    
+    def measure_page_weights(self) -> Dict[str, Dict[str, Dict[str, int]]]:
+        """Raw and compressed HTML/CSS/JS/image weight for every page and JSON endpoint"""
+        from concurrent.futures import ThreadPoolExecutor
+        pages = sorted(p for p in self.dist_path.rglob("*")
+                       if p.is_file() and p.suffix in (".html", ".json")
+                       and (p.suffix == ".html" or p.relative_to(self.dist_path).parts[0] == "api"))
+        
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 4) as pool:
+            page_assets = dict(zip(pages, pool.map(
+                lambda p: self.page_assets(p) if p.suffix == ".html" else {"css": [], "js": [], "images": []},
+                pages)))
+            # Shared assets are measured once however many pages reference them
+            files = sorted(set(pages) | {a for assets in page_assets.values()
+                                         for paths in assets.values() for a in paths})
+            sizes = dict(zip(files, pool.map(lambda f: (f.stat().st_size, self.compressed_size(f)), files)))
+        
+        report = {}
+        for page in pages:
+            # JSON endpoints count their body as the document weight
+            groups = {"html": [page], **page_assets[page]}
+            raw = {kind: sum(sizes[f][0] for f in paths) for kind, paths in groups.items()}
+            compressed = {kind: sum(sizes[f][1] for f in paths) for kind, paths in groups.items()}
+            raw["total"], compressed["total"] = sum(raw.values()), sum(compressed.values())
+            report[self.page_url(page)] = {"raw": raw, "compressed": compressed}
+        return report
+    
+    def check_page_budgets(self) -> bool:
+        """Report page weights against budgets and the previous build; False if over budget"""
+        import shutil
+        from datetime import datetime, timezone
+        import fnmatch
+        
+        if not self.dist_path.is_dir():
+            print("No dist/ directory found. Build the website first.")
+            return False
+        
+        pages = self.measure_page_weights()
+        budgets, overrides = self.load_page_budgets()
+        
+        # Compare with the last different build so re-running on the same dist/ keeps its deltas
+        previous_file = self.page_weights_file.with_suffix(".prev.json")
+        latest = {}
+        if self.page_weights_file.exists():
+            with open(self.page_weights_file, 'r', encoding='utf-8') as f:
+                latest = json.load(f).get("pages", {})
+        if latest and latest != pages:
+            shutil.copy2(self.page_weights_file, previous_file)
+        previous = {}
+        if previous_file.exists():
+            with open(previous_file, 'r', encoding='utf-8') as f:
+                previous = json.load(f).get("pages", {})
+        self.state_dir.mkdir(exist_ok=True)
+        with open(self.page_weights_file, 'w', encoding='utf-8') as f:
+            json.dump({"measuredAt": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                       "pages": pages}, f, indent=2)
+        
+        kinds = ("html", "css", "js", "images", "total")
+        width = max([len(url) for url in pages] + [4])
+        print(f"\n📏 Page weights (compressed, {len(pages)} pages)")
+        print(f"{'Page':<{width}} " + " ".join(f"{k.upper():>9}" for k in kinds) + f" {'Raw':>9} {'vs prev':>9}")
+        
+        violations = []
+        for url, weight in pages.items():
+            limits = dict(budgets)
+            for pattern, override in overrides.items():
+                if fnmatch.fnmatch(url, pattern):
+                    limits.update(override)
+            compressed = weight["compressed"]
+            over = [kind for kind in kinds if kind in limits and compressed[kind] > limits[kind]]
+            violations.extend((url, kind, compressed[kind], limits[kind]) for kind in over)
+            
+            if url in previous:
+                delta = compressed["total"] - previous[url]["compressed"]["total"]
+                change = "=" if delta == 0 else ("+" if delta > 0 else "-") + self.format_size(abs(delta))
+            else:
+                change = "new"
+            row = " ".join(f"{self.format_size(compressed[k]):>9}" for k in kinds)
+            print(f"{url:<{width}} {row} {self.format_size(weight['raw']['total']):>9} {change:>9}"
+                  + ("  ✗" if over else ""))
+        
+        for url in sorted(set(previous) - set(pages)):
+            print(f"{url:<{width}} (removed)")
+        
+        if violations:
+            print(f"\n✗ {len(violations)} budget(s) exceeded:")
+            for url, kind, size, limit in violations:
+                print(f"  {url}: {kind} {self.format_size(size)} > {self.format_size(limit)} "
+                      f"(+{self.format_size(size - limit)})")
+            return False
+        print("\n✓ All pages within budget")
+        return True
+    
+    def update_deploy_manifest(self) -> Optional[Dict[str, List[Dict]]]:
+        """Hash dist/ after a build and record the changeset against the previous build"""
+        import shutil
+        from datetime import datetime
+        if not self.dist_path.is_dir():
+            print("No dist/ directory found. Build the website first.")
+            return None
+        
+        deploy_dir = self.state_dir / "deploy"
+        deploy_dir.mkdir(parents=True, exist_ok=True)
+        manifest_file = deploy_dir / "manifest.json"
+        
+        started = datetime.now()
+        manifest = self.build_dist_manifest()
+        elapsed = (datetime.now() - started).total_seconds()
+        
+        previous = {}
+        if manifest_file.exists():
+            with open(manifest_file, 'r') as f:
+                previous = json.load(f)
+            shutil.copyfile(manifest_file, deploy_dir / "manifest.prev.json")
+        changeset = self.diff_manifests(previous, manifest)
+        
+        with open(manifest_file, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        with open(deploy_dir / "changeset.json", 'w') as f:
+            json.dump(changeset, f, indent=2)
+        
+        summary = {
+            "timestamp": started.isoformat(timespec='seconds'),
+            "files": len(manifest),
+            "bytes": sum(entry["size"] for entry in manifest.values()),
+            "hashSeconds": round(elapsed, 3),
+            **{kind: len(entries) for kind, entries in changeset.items()},
+            "changedBytes": sum(e["size"] for kind in ("added", "modified") for e in changeset[kind])
+        }
+        with open(deploy_dir / "builds.jsonl", 'a') as f:
+            f.write(json.dumps(summary) + "\n")
+        
+        print(f"\n📦 Deploy manifest: {len(manifest)} files, "
+              f"{self.format_size(summary['bytes'])} hashed in {elapsed:.2f}s")
+        self.print_changeset(changeset, len(manifest))
+        return changeset
+    
+    def deploy_to_directory(self, target: Path, dry_run: bool = False) -> Dict[str, List[Dict]]:
+        """Sync dist/ to a local stand-in deploy target, copying only changed files"""
+        import shutil
+        manifest_name = ".deploy-manifest.json"
+        target_manifest = target / manifest_name
+        deployed = {}
+        if target_manifest.exists():
+            with open(target_manifest, 'r') as f:
+                deployed = json.load(f)
+        
+        manifest = self.build_dist_manifest()
+        changeset = self.diff_manifests(deployed, manifest)
+        print(f"\n--- DEPLOY TO {target} {'(dry run) ' if dry_run else ''}---")
+        self.print_changeset(changeset, len(manifest))
+        if dry_run:
+            return changeset
+        
+        for entry in changeset["added"] + changeset["modified"]:
+            destination = target / entry["path"]
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(self.dist_path / entry["path"], destination)
+        for entry in changeset["removed"]:
+            (target / entry["path"]).unlink(missing_ok=True)
+        
+        with open(target_manifest, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        print(f"✓ Deployed to {target}")
+        return changeset
+    
+    def gallery_sources(self) -> List[str]:
+        """Every gallery image referenced by a project, in order"""
+        sources = []
+        for project in self.load_section("projects"):
+            for image in project.get('gallery', []):
+                if image.get('src') and image['src'] not in sources:
+                    sources.append(image['src'])
+        return sources
+    
+    def probe_image_size(self, filepath: Path) -> Tuple[str, Optional[int], Optional[int]]:
+        """(format, width, height) read from an image's header without decoding pixels"""
+        import struct
+        with open(filepath, 'rb') as f:
+            head = f.read(64)
+            if head.startswith(b'\x89PNG\r\n\x1a\n') and head[12:16] == b'IHDR':
+                width, height = struct.unpack('>II', head[16:24])
+                return "png", width, height
+            if head[:6] in (b'GIF87a', b'GIF89a'):
+                width, height = struct.unpack('<HH', head[6:10])
+                return "gif", width, height
+            if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+                chunk = head[12:16]
+                if chunk == b'VP8 ':
+                    width, height = struct.unpack('<HH', head[26:30])
+                    return "webp", width & 0x3FFF, height & 0x3FFF
+                if chunk == b'VP8L':
+                    b0, b1, b2, b3 = head[21:25]
+                    return ("webp", 1 + (((b1 & 0x3F) << 8) | b0),
+                            1 + (((b3 & 0x0F) << 10) | (b2 << 2) | ((b1 & 0xC0) >> 6)))
+                if chunk == b'VP8X':
+                    return ("webp", 1 + int.from_bytes(head[24:27], 'little'),
+                            1 + int.from_bytes(head[27:30], 'little'))
+                return "webp", None, None
+            if head[:2] == b'\xff\xd8':
+                # Walk JPEG segments to the first start-of-frame marker
+                f.seek(2)
+                while True:
+                    marker = f.read(2)
+                    if len(marker) < 2 or marker[0] != 0xFF:
+                        return "jpeg", None, None
+                    while marker[1] == 0xFF:  # Fill bytes
+                        marker = marker[1:] + f.read(1)
+                    code = marker[1]
+                    if code in (0xD8, 0x01) or 0xD0 <= code <= 0xD7:
+                        continue  # Standalone markers carry no length
+                    length = struct.unpack('>H', f.read(2))[0]
+                    if 0xC0 <= code <= 0xCF and code not in (0xC4, 0xC8, 0xCC):
+                        height, width = struct.unpack('>xHH', f.read(5))
+                        return "jpeg", width, height
+                    f.seek(length - 2, 1)
+            if head[4:12] in (b'ftypavif', b'ftypavis'):
+                return "avif", None, None
+            if filepath.suffix.lower() == ".svg":
+                f.seek(0)
+                root = re.search(rb'<svg\b[^>]*>', f.read(8192))
+                if not root:
+                    return "svg", None, None
+                attrs = dict(re.findall(rb'([\w:-]+)\s*=\s*["\']([^"\']*)["\']', root.group(0)))
+                
+                def length(value: Optional[bytes]) -> Optional[int]:
+                    match = re.fullmatch(rb'\s*([\d.]+)\s*(px)?\s*', value or b'')
+                    return round(float(match.group(1))) if match else None
+                
+                width, height = length(attrs.get(b'width')), length(attrs.get(b'height'))
+                view_box = (attrs.get(b'viewBox') or b'').replace(b',', b' ').split()
+                if (width is None or height is None) and len(view_box) == 4:
+                    width, height = round(float(view_box[2])), round(float(view_box[3]))
+                return "svg", width, height
+        return filepath.suffix.lstrip('.').lower() or "unknown", None, None
+    
+    def probe_gallery_images(self, quiet: bool = False) -> Optional[Dict[str, Dict]]:
+        """Record width/height, bytes and hash for every gallery image in image-meta.json.
+        Files are re-hashed only when their size or mtime changes, and re-probed only when
+        their hash changes. Also warns about oversized files anywhere in public/images/."""
+        from concurrent.futures import ThreadPoolExecutor
+        cache = {"files": {}, "probes": {}}
+        if self.image_probe_cache.exists():
+            with open(self.image_probe_cache, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        
+        sources = self.gallery_sources()
+        images_dir = self.public_path / "images"
+        extra = [path for path in images_dir.rglob("*")
+                 if path.suffix.lower() in self.image_types and self.image_variants_dir not in path.parents]
+        paths = {src: self.public_path / src.lstrip('/') for src in sources}
+        for path in extra:
+            paths.setdefault("/" + path.relative_to(self.public_path).as_posix(), path)
+        
+        def probe(item: Tuple[str, Path]) -> Tuple[str, Optional[Dict]]:
+            src, path = item
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                return src, None
+            cached = cache["files"].get(src)
+            if cached and cached["mtime"] == stat.st_mtime_ns and cached["bytes"] == stat.st_size:
+                digest = cached["hash"]
+            else:
+                digest = self.hash_file(path)[:16]
+            info = cache["probes"].get(digest)
+            if info is None:
+                fmt, width, height = self.probe_image_size(path)
+                info = {"format": fmt, "width": width, "height": height}
+            return src, {"mtime": stat.st_mtime_ns, "bytes": stat.st_size, "hash": digest, **info}
+        
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 4) as pool:
+            results = dict(pool.map(probe, paths.items()))
+        
+        missing = [src for src in sources if results.get(src) is None]
+        for src in missing:
+            print(f"⚠️  Gallery image not found: public{src}")
+        
+        cache = {"files": {src: info for src, info in results.items() if info},
+                 "probes": {info["hash"]: {key: info[key] for key in ("format", "width", "height")}
+                            for info in results.values() if info}}
+        self.state_dir.mkdir(exist_ok=True)
+        with open(self.image_probe_cache, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, separators=(',', ':'))
+        
+        meta = {src: {key: results[src][key] for key in ("width", "height", "bytes", "hash", "format")}
+                for src in sources if results.get(src)}
+        content = json.dumps(meta, indent=2, sort_keys=True) + "\n"
+        if not self.image_meta_file.exists() or self.image_meta_file.read_text() != content:
+            self.image_meta_file.write_text(content)
+            if not quiet:
+                print(f"✓ Updated {self.image_meta_file.name}")
+        
+        for src, info in sorted(results.items()):
+            if info and info["bytes"] > self.image_weight_warning:
+                print(f"⚠️  public{src} is {self.format_size(info['bytes'])} "
+                      f"(over {self.format_size(self.image_weight_warning)})")
+            elif info and src in meta and info["width"] is None and not quiet:
+                print(f"⚠️  Could not read dimensions of public{src} ({info['format']})")
+        if not quiet:
+            print(f"✓ Probed {len(meta)} gallery image(s), {len(results) - len(meta)} other image(s)")
+        return meta
+    
+    def available_image_formats(self) -> Optional[List[str]]:
+        """Variant formats Pillow can encode here, or None without Pillow"""
+        try:
+            from PIL import features
+        except ImportError:
+            return None
+        formats = [fmt for fmt in self.image_formats if fmt != "avif" or features.check("avif")]
+        if "avif" in self.image_formats and "avif" not in formats:
+            try:
+                import pillow_avif  # noqa: F401 - registers the AVIF plugin
+                formats.insert(0, "avif")
+            except ImportError:
+                pass
+        return formats
+    
+    def generate_image_variants(self, force: bool = False, quiet: bool = False) -> Optional[Dict]:
+        """Build width-bucketed AVIF/WebP/PNG variants for gallery images.
+        
+        Results are cached in the variant manifest by source hash + parameters,
+        so unchanged images are never reprocessed.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        sources = self.gallery_sources()
+        formats = self.available_image_formats()
+        if formats is None:
+            if not quiet or sources:
+                print("⚠️  Pillow is not installed; skipping image variants (pip install Pillow)")
+            return None
+        
+        manifest = {}
+        if self.image_variants_file.exists():
+            with open(self.image_variants_file, 'r') as f:
+                manifest = json.load(f)
+        params = self.content_hash({"widths": self.image_widths, "formats": formats})
+        
+        jobs, updated = [], {}
+        for src in sources:
+            path = self.public_path / src.lstrip('/')
+            if not path.exists():
+                print(f"⚠️  Gallery image not found: {src}")
+                continue
+            digest = self.hash_file(path)
+            cached = manifest.get(src)
+            if (not force and cached and cached.get("hash") == digest and cached.get("params") == params
+                    and all((self.public_path / v["src"].lstrip('/')).exists()
+                            for fmt_variants in cached["variants"].values() for v in fmt_variants)):
+                updated[src] = cached
+                continue
+            jobs.append({
+                "src": src,
+                "path": str(path),
+                "stem": path.stem,
+                "hash": digest,
+                "widths": self.image_widths,
+                "formats": formats,
+                "out_dir": str(self.image_variants_dir),
+                "url_prefix": "/" + self.image_variants_dir.relative_to(self.public_path).as_posix()
+            })
+        
+        if jobs:
+            self.image_variants_dir.mkdir(parents=True, exist_ok=True)
+            with ProcessPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as pool:
+                for job, result in zip(jobs, pool.map(render_image_variants, jobs)):
+                    updated[job["src"]] = {"hash": job["hash"], "params": params, **result}
+                    if not quiet:
+                        count = sum(len(v) for v in result["variants"].values())
+                        print(f"✓ {job['src']}: {count} variants")
+        
+        # Drop variants no longer referenced by any gallery image
+        referenced = {v["src"] for entry in updated.values()
+                      for fmt_variants in entry["variants"].values() for v in fmt_variants}
+        if self.image_variants_dir.is_dir():
+            for variant in self.image_variants_dir.iterdir():
+                if "/" + variant.relative_to(self.public_path).as_posix() not in referenced:
+                    variant.unlink()
+        
+        ordered = {src: updated[src] for src in sources if src in updated}
+        if ordered != manifest:
+            with open(self.image_variants_file, 'w') as f:
+                json.dump(ordered, f, indent=2)
+                f.write("\n")
+        if not quiet:
+            print(f"Images: {len(jobs)} processed, {len(ordered) - len(jobs)} cached")
+        return ordered
+    
+    def project_link(self, value: str) -> str:
+        """A stored project link (`github.com/...`) as an absolute URL, as /api/cv.json publishes it"""
+        return value if not value or "://" in value else f"https://{value}"
+    
+    def api_project(self, project: Dict) -> Dict:
+        """A project's full entry with its links normalised as /api/cv.json publishes them
+        (src/pages/api/cv.json.ts)"""
+        return {**project, "github": self.project_link(project.get('github', '')) or None,
+                "live": self.project_link(project.get('live', '')) or None}
+    
+    def static_api_resources(self, section: str, data: Any) -> Dict[str, Any]:
+        """Documents a section publishes, keyed by path under api/"""
+        if section == "projects":
+            resources = {"projects.json": [
+                {"slug": project.get('slug', ''), "name": project.get('name', ''),
+                 "description": project.get('description', ''), "techStack": project.get('techStack', []),
+                 "url": f"/projects/{project.get('slug', '')}", "resource": f"/api/projects/{project.get('slug', '')}.json"}
+                for project in data]}
+            for project in data:
+                resources[f"projects/{project.get('slug', '')}.json"] = self.api_project(project)
+        elif section == "certifications":
+            resources = {"certifications.json": [
+                {**cert, "status": "planned" if "planned" in cert.get('date', '').lower() else "earned"}
+                for cert in data]}
+        else:
+            resources = {f"{section}.json": data}
+        if section in ("skills", "projects"):
+            resources["technologies.json"] = self.compute_derived_data()["technologies"]
+        return resources
+    
+    def write_static_api(self, sections: Optional[List[str]] = None) -> Dict[str, int]:
+        """Write per-resource JSON under public/api/ plus index.json of content hashes,
+        touching only documents whose content changed"""
+        import hashlib
+        index_file = self.static_api_dir / "index.json"
+        index = {"version": 1, "resources": {}}
+        if index_file.exists():
+            with open(index_file, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        resources = dict(index["resources"])
+        written = removed = 0
+        
+        for section in sections or self.data_files:
+            documents = self.static_api_resources(section, self.load_section(section))
+            urls = {f"/api/{path}" for path in documents}
+            for url, info in list(resources.items()):
+                if info["section"] == section and url not in urls and url != "/api/technologies.json":
+                    (self.public_path / url.lstrip('/')).unlink(missing_ok=True)
+                    del resources[url]
+                    removed += 1
+            
+            for path, document in documents.items():
+                content = json.dumps(document, ensure_ascii=False, separators=(',', ':')) + "\n"
+                digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:16]
+                url, target = f"/api/{path}", self.static_api_dir / path
+                if resources.get(url, {}).get("hash") == digest and target.exists():
+                    continue
+                target.parent.mkdir(parents=True, exist_ok=True)
+                target.write_text(content, encoding='utf-8')
+                resources[url] = {"section": section, "hash": digest, "bytes": len(content.encode('utf-8'))}
+                written += 1
+        
+        updated = {"version": 1, "resources": dict(sorted(resources.items()))}
+        if updated != index or not index_file.exists():
+            self.static_api_dir.mkdir(parents=True, exist_ok=True)
+            with open(index_file, 'w', encoding='utf-8') as f:
+                json.dump(updated, f, indent=2)
+                f.write("\n")
+        return {"resources": len(resources), "written": written, "removed": removed}
+    
+    def search_terms(self, text: str) -> List[str]:
+        """Lowercase index terms; dotted names like node.js also index their parts"""
+        terms = []
+        for token in re.findall(r'[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*', text.lower()):
+            parts = [token] + (token.split('.') if '.' in token else [])
+            terms.extend(part for part in parts if len(part) > 1 and part not in self.search_stopwords)
+        return terms
+    
+    def search_slug(self, text: str) -> str:
+        """URL-safe identifier fragment"""
+        return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+    
+    def search_documents(self, section: str, data: Any) -> Iterator[Tuple[str, Dict, Dict]]:
+        """(id, display fields, searchable fields) for each entry of a searchable section"""
+        if section == "skills":
+            for category, skills in data.items():
+                yield (f"skills:{self.search_slug(category)}",
+                       {"t": category, "u": "/#skills", "s": ", ".join(skills)[:140]},
+                       {"category": category, "skills": skills})
+        elif section == "projects":
+            for project in data:
+                yield (f"projects:{project.get('slug', '')}",
+                       {"t": project.get('name', ''), "u": f"/projects/{project.get('slug', '')}",
+                        "s": project.get('description', '')[:140]}, project)
+        else:
+            for entry in data:
+                yield (f"{section}:{self.search_slug(self.entry_key(section, entry))}",
+                       {"t": f"{entry.get('title', '')} at {entry.get('company', '')}", "u": f"/#{section}",
+                        "s": entry.get('period', '')}, entry)
+    
+    def search_doc_key(self, doc_id: str) -> str:
+        """Display-data shard of a doc id: its section plus the first characters of its slug"""
+        section, _, slug = doc_id.partition(':')
+        return f"{section}-{re.sub(r'[^a-z0-9]', '_', slug[:self.search_doc_prefix_length])}"
+    
+    def build_search_partial(self, section: str, data: Any) -> Dict:
+        """Inverted index for one section: term -> {doc id: weighted score}, plus doc display data"""
+        weights = self.search_fields[section]
+        docs, terms = {}, {}
+        for doc_id, display, fields in self.search_documents(section, data):
+            docs[doc_id] = {**display, "c": section}
+            for field, weight in weights.items():
+                value = fields.get(field)
+                text = " ".join(value) if isinstance(value, list) else (value or "")
+                # Each field counts once per term so long descriptions can't swamp titles
+                for term in set(self.search_terms(text)):
+                    postings = terms.setdefault(term, {})
+                    postings[doc_id] = postings.get(doc_id, 0) + weight
+        return {"hash": self.content_hash(data), "docs": docs, "terms": terms}
+    
+    def update_search_index(self, sections: Optional[List[str]] = None) -> Dict[str, int]:
+        """Refresh public/search/ incrementally: rebuild only the given (or changed) sections'
+        partial indexes, then rewrite just the shards whose contents changed"""
+        import hashlib
+        self.search_cache_dir.mkdir(parents=True, exist_ok=True)
+        partials = {}
+        for section in self.search_fields:
+            cache_file = self.search_cache_dir / f"{section}.json"
+            cached = None
+            if cache_file.exists():
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    cached = json.load(f)
+            # Sections not named are trusted from the cache; named ones are re-hashed
+            if cached and sections is not None and section not in sections:
+                partials[section] = cached
+                continue
+            data = self.load_section(section)
+            if cached and cached["hash"] == self.content_hash(data):
+                partials[section] = cached
+                continue
+            partials[section] = self.build_search_partial(section, data)
+            with open(cache_file, 'w', encoding='utf-8') as f:
+                json.dump(partials[section], f, ensure_ascii=False, separators=(',', ':'))
+        
+        shards, docs = {}, {}
+        for partial in partials.values():
+            for doc_id, doc in partial["docs"].items():
+                docs.setdefault(self.search_doc_key(doc_id), {})[doc_id] = doc
+            for term, postings in partial["terms"].items():
+                key = re.sub(r'[^a-z0-9]', '_', term[:self.search_prefix_length])
+                shards.setdefault(key, {}).setdefault(term, {}).update(postings)
+        
+        manifest_file = self.search_dir / "index.json"
+        previous = {}
+        if manifest_file.exists():
+            with open(manifest_file, 'r', encoding='utf-8') as f:
+                previous = json.load(f)
+        (self.search_dir / "docs").mkdir(parents=True, exist_ok=True)
+        
+        def write(name: str, value: Any, old_hash: Optional[str]) -> Tuple[str, bool]:
+            content = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+            digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:12]
+            target = self.search_dir / name
+            if digest == old_hash and target.exists():
+                return digest, False
+            target.write_text(content + "\n", encoding='utf-8')
+            return digest, True
+        
+        written = 0
+        shard_hashes = {}
+        for key in sorted(shards):
+            shard_hashes[key], changed = write(f"{key}.json", shards[key], previous.get("shards", {}).get(key))
+            written += changed
+        previous_docs = previous.get("docs") if isinstance(previous.get("docs"), dict) else {}
+        doc_hashes = {}
+        for key in sorted(docs):
+            doc_hashes[key], changed = write(f"docs/{key}.json", docs[key], previous_docs.get(key))
+            written += changed
+        removed = 0
+        for key in set(previous.get("shards", {})) - set(shards):
+            (self.search_dir / f"{key}.json").unlink(missing_ok=True)
+            removed += 1
+        for key in set(previous_docs) - set(docs):
+            (self.search_dir / "docs" / f"{key}.json").unlink(missing_ok=True)
+            removed += 1
+        if (self.search_dir / "docs.json").exists():
+            (self.search_dir / "docs.json").unlink()  # Single-file layout from version 1
+            removed += 1
+        
+        manifest = {"version": 2, "prefixLength": self.search_prefix_length,
+                    "docPrefixLength": self.search_doc_prefix_length,
+                    "docs": doc_hashes, "shards": shard_hashes}
+        if manifest != previous:
+            with open(manifest_file, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2, sort_keys=True)
+                f.write("\n")
+        return {"shards": len(shards), "written": written, "removed": removed,
+                "docs": sum(len(shard) for shard in docs.values())}
+    
+    def index_rows(self, section: str, data: Any) -> List[Dict]:
+        """Flatten a section into the indexed columns used by list views"""
+        if section == "skills":
+            data = [{"category": category, "skills": skills} for category, skills in data.items()]
+        elif not isinstance(data, list):
+            return []
+        
+        rows = [self.index_row(section, position, entry) for position, entry in enumerate(data)]
+        # Duplicate identities keep distinct rows
+        seen = {}
+        for row in rows:
+            count = seen[row["key"]] = seen.get(row["key"], 0) + 1
+            if count > 1:
+                row["key"] = f"{row['key']}#{count}"
+        return rows
+    
+    def index_row(self, section: str, position: int, entry: Dict) -> Dict:
+        """Indexed columns for a single entry"""
+        def year(text: str) -> Optional[int]:
+            match = re.search(r'\d{4}', text or "")
+            return int(match.group(0)) if match else None
+        
+        date_text = entry.get('period') or entry.get('date') or ""
+        period = self.entry_period(entry)
+        return {
+            "position": position,
+            "key": entry['category'] if section == "skills" else self.entry_key(section, entry),
+            "hash": self.content_hash(entry),
+            "title": entry.get('name') or entry.get('title') or entry.get('degree') or entry.get('category'),
+            "company": entry.get('company') or entry.get('organization') or entry.get('institution'),
+            "issuer": entry.get('issuer'),
+            "date_text": date_text,
+            "year": year(date_text),
+            "start_month": period[0] if period else None,
+            "end_month": period[1] if period else None,
+            "ongoing": 1 if period and period[1] is None else 0,
+            "expiry_year": year(entry.get('expiryDate')),
+            "techs": entry.get('techStack') or entry.get('skills') or [],
+            "entry": entry
+        }
+    
+    def connect_db(self):
+        """Open the SQLite mirror, creating the schema on first use"""
+        import sqlite3
+        self.state_dir.mkdir(exist_ok=True)
+        conn = sqlite3.connect(self.db_file)
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        outdated = version < self.db_schema_version and conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'entries'").fetchone() is not None
+        if outdated:
+            # The mirror is derived data: recreate it rather than migrate in place
+            conn.executescript("DROP TABLE entries; DROP TABLE IF EXISTS technologies; "
+                               "DROP TABLE IF EXISTS sources;")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                section TEXT NOT NULL,
+                key TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                hash TEXT NOT NULL,
+                title TEXT,
+                company TEXT,
+                issuer TEXT,
+                date_text TEXT,
+                year INTEGER,
+                start_month INTEGER,
+                end_month INTEGER,
+                ongoing INTEGER NOT NULL DEFAULT 0,
+                expiry_year INTEGER,
+                data TEXT NOT NULL,
+                PRIMARY KEY (section, key)
+            );
+            CREATE TABLE IF NOT EXISTS technologies (
+                section TEXT NOT NULL,
+                key TEXT NOT NULL,
+                tech TEXT NOT NULL COLLATE NOCASE
+            );
+            CREATE TABLE IF NOT EXISTS sources (
+                section TEXT PRIMARY KEY,
+                source_key TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_entries_position ON entries(section, position);
+            CREATE INDEX IF NOT EXISTS idx_entries_title ON entries(section, title);
+            CREATE INDEX IF NOT EXISTS idx_entries_company ON entries(section, company COLLATE NOCASE);
+            CREATE INDEX IF NOT EXISTS idx_entries_issuer ON entries(section, issuer COLLATE NOCASE);
+            CREATE INDEX IF NOT EXISTS idx_entries_year ON entries(section, year);
+            CREATE INDEX IF NOT EXISTS idx_entries_period ON entries(section, start_month, end_month);
+            CREATE INDEX IF NOT EXISTS idx_entries_expiry ON entries(section, expiry_year);
+            CREATE INDEX IF NOT EXISTS idx_technologies_tech ON technologies(tech, section, key);
+            CREATE INDEX IF NOT EXISTS idx_technologies_entry ON technologies(section, key);
+        """)
+        conn.execute(f"PRAGMA user_version = {self.db_schema_version}")
+        if outdated:
+            conn.close()
+            print("⚠️  SQLite mirror schema changed; rebuilding it")
+            self.rebuild_db()
+            conn = sqlite3.connect(self.db_file)
+        return conn
+    
+    def sync_section_db(self, section: str, data: Any):
+        """Bring one section of the mirror up to date, touching only changed rows, and record
+        the source files' state it was synced from"""
+        rows = self.index_rows(section, data)
+        conn = self.connect_db()
+        try:
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO sources VALUES (?, ?)",
+                             (section, json.dumps(self.section_key(section))))
+                existing = {key: (position, digest) for key, position, digest in conn.execute(
+                    "SELECT key, position, hash FROM entries WHERE section = ?", (section,))}
+                changed = [row for row in rows if existing.get(row["key"], (None, None))[1] != row["hash"]]
+                changed_keys = {row["key"] for row in changed}
+                moved = [(row["position"], section, row["key"]) for row in rows
+                         if row["key"] in existing and row["key"] not in changed_keys
+                         and existing[row["key"]][0] != row["position"]]
+                removed = [(section, key) for key in existing.keys() - {row["key"] for row in rows}]
+                
+                conn.executemany("DELETE FROM entries WHERE section = ? AND key = ?", removed)
+                conn.executemany("DELETE FROM technologies WHERE section = ? AND key = ?",
+                                 removed + [(section, row["key"]) for row in changed])
+                conn.executemany("UPDATE entries SET position = ? WHERE section = ? AND key = ?", moved)
+                conn.executemany(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(section, row["key"], row["position"], row["hash"], row["title"], row["company"],
+                      row["issuer"], row["date_text"], row["year"], row["start_month"], row["end_month"],
+                      row["ongoing"], row["expiry_year"],
+                      json.dumps(row["entry"], ensure_ascii=False)) for row in changed])
+                conn.executemany("INSERT INTO technologies VALUES (?, ?, ?)",
+                                 [(section, row["key"], tech) for row in changed for tech in row["techs"]])
+        finally:
+            conn.close()
+        return len(changed), len(moved), len(removed)
+    
+    def db_section_fresh(self, section: str) -> bool:
+        """Whether the mirror was synced from the section's files as they are now"""
+        conn = self.connect_db()
+        try:
+            row = conn.execute("SELECT source_key FROM sources WHERE section = ?", (section,)).fetchone()
+        finally:
+            conn.close()
+        return row is not None and row[0] == json.dumps(self.section_key(section))
+    
+    def rebuild_db(self):
+        """Create (or resync) the SQLite mirror from every listable section"""
+        for section in self.data_files:
+            if section == "personal":
+                continue
+            changed, moved, removed = self.sync_section_db(section, self.load_section(section))
+            print(f"✓ {section}: {changed} updated, {moved} moved, {removed} removed")
+    
+    def list_entries(self, section: str, filters: Dict[str, str], sort: str = "position",
+                     page: int = 1, page_size: int = 10) -> Tuple[List[Dict], Optional[int], bool]:
+        """One page of a section, the total match count (None if not counted) and whether more follow"""
+        if self.db_file.exists():
+            if not self.db_section_fresh(section):
+                # Changed outside the manager (hand edit, git pull, migrate): resync first
+                self.sync_section_db(section, self.load_section(section))
+            rows, total = self.query_db(section, filters, sort, page, page_size)
+            return rows, total, page * page_size < total
+        
+        start = (page - 1) * page_size
+        if sort == "position" and section != "skills":
+            # Stream in file order and stop one entry past the requested page
+            matches = (entry for entry in self.iter_section_entries(section)
+                       if not filters or self.row_matches(self.index_row(section, 0, entry), filters))
+            rows = list(islice(matches, start, start + page_size + 1))
+            return rows[:page_size], None, len(rows) > page_size
+        
+        rows = self.index_rows(section, self.load_section(section))
+        matches = [row for row in rows if self.row_matches(row, filters)]
+        if sort == "date":
+            matches.sort(key=lambda row: self.period_sort_key(row["entry"]))
+        elif sort != "position":
+            matches.sort(key=lambda row: (row[sort] is None, (row[sort] or "").lower()))
+        return [row["entry"] for row in matches[start:start + page_size]], len(matches), start + page_size < len(matches)
+    
+    def covers_year(self, row: Dict, value: str) -> bool:
+        """Whether an entry's period includes any month of the given year"""
+        if not value.isdigit():
+            return False
+        year = int(value)
+        if row["start_month"] is None:
+            return row["year"] == year
+        end = self.current_month() if row["ongoing"] else row["end_month"]
+        return row["start_month"] <= year * 12 + 11 and end >= year * 12
+    
+    def row_matches(self, row: Dict, filters: Dict[str, str]) -> bool:
+        """In-memory equivalent of the SQL filters"""
+        for name, value in filters.items():
+            wanted = value.lower()
+            if name == "tech" and not any(t.lower() == wanted for t in row["techs"]):
+                return False
+            if name in ("company", "issuer") and (row[name] or "").lower() != wanted:
+                return False
+            if name == "year" and not self.covers_year(row, value):
+                return False
+            if name == "expires" and str(row["expiry_year"]) != value:
+                return False
+            if name == "text" and wanted not in json.dumps(row["entry"], ensure_ascii=False).lower():
+                return False
+        return True
+    
+    def query_db(self, section: str, filters: Dict[str, str], sort: str,
+                 page: int, page_size: int) -> Tuple[List[Dict], int]:
+        """Filtered, sorted page straight from the SQLite indexes"""
+        where, params = ["e.section = ?"], [section]
+        for name, value in filters.items():
+            if name == "tech":
+                where.append("EXISTS (SELECT 1 FROM technologies t WHERE t.tech = ? "
+                             "AND t.section = e.section AND t.key = e.key)")
+                params.append(value)
+            elif name in ("company", "issuer"):
+                where.append(f"e.{name} = ? COLLATE NOCASE")
+                params.append(value)
+            elif name == "year":
+                # Entries active at any point in the year; unparsed periods match their first year
+                year = int(value) if value.isdigit() else -1
+                where.append("(CASE WHEN e.start_month IS NULL THEN e.year = ? ELSE e.start_month <= ? "
+                             "AND (e.ongoing = 1 OR e.end_month >= ?) END)")
+                params.extend([year, year * 12 + 11, year * 12])
+            elif name == "expires":
+                where.append("e.expiry_year = ?")
+                params.append(int(value) if value.isdigit() else -1)
+            elif name == "text":
+                where.append("e.data LIKE ?")
+                params.append(f"%{value}%")
+        order = {
+            "position": "e.position",
+            "title": "e.title, e.position",
+            "company": "e.company COLLATE NOCASE, e.position",
+            "issuer": "e.issuer COLLATE NOCASE, e.position",
+            "date": "e.start_month IS NULL, e.ongoing DESC, e.end_month DESC, e.start_month DESC, e.position"
+        }[sort]
+        clause = " AND ".join(where)
+        
+        conn = self.connect_db()
+        try:
+            total = conn.execute(f"SELECT COUNT(*) FROM entries e WHERE {clause}", params).fetchone()[0]
+            rows = conn.execute(f"SELECT e.data FROM entries e WHERE {clause} ORDER BY {order} "
+                                "LIMIT ? OFFSET ?", params + [page_size, (page - 1) * page_size]).fetchall()
+        finally:
+            conn.close()
+        return [json.loads(data) for (data,) in rows], total
     
     def backup_data(self):
         """Create backup of all data files"""
+        import shutil
+        from datetime import datetime
         backup_dir = self.base_path.parent / "backups"
         backup_dir.mkdir(exist_ok=True)
         
@@ -1170,6 +4122,12 @@ class CVManager:
                 with open(dst, 'w') as f:
                     f.write(content)
                 print(f"✓ Backed up {filename}")
+            
+            json_src = self.json_store / f"{name}.json"
+            if self.use_json_store and json_src.exists():
+                (backup_subdir / "json").mkdir(exist_ok=True)
+                shutil.copyfile(json_src, backup_subdir / "json" / json_src.name)
+                print(f"✓ Backed up json/{json_src.name}")
         
         print(f"\nBackup saved to: {backup_subdir}")
         return backup_subdir
@@ -1179,37 +4137,201 @@ class CVManager:
         print("\n🚀 Welcome to CV Website Content Manager!")
         print("This tool helps you manage your CV website data with ease.")
         
-        while True:
-            self.display_menu()
-            choice = input("\nEnter your choice: ").strip()
-            
-            if choice == "1":
-                self.manage_personal()
-            elif choice == "2":
-                self.manage_skills()
-            elif choice == "3":
-                self.manage_experience()
-            elif choice == "4":
-                self.manage_projects()
-            elif choice == "5":
-                self.manage_education()
-            elif choice == "6":
-                self.manage_certifications()
-            elif choice == "7":
-                self.manage_community()
-            elif choice == "8":
-                self.build_website()
-            elif choice == "9":
-                self.backup_data()
-            elif choice == "0":
-                print("\nGoodbye! 👋")
-                break
-            else:
-                print("Invalid choice. Please try again.")
-            
-            if choice != "0":
-                input("\nPress Enter to continue...")
+        try:
+            while True:
+                self.display_menu()
+                choice = input("\nEnter your choice: ").strip()
+                
+                if choice == "1":
+                    self.manage_personal()
+                elif choice == "2":
+                    self.manage_skills()
+                elif choice == "3":
+                    self.manage_experience()
+                elif choice == "4":
+                    self.manage_projects()
+                elif choice == "5":
+                    self.manage_education()
+                elif choice == "6":
+                    self.manage_certifications()
+                elif choice == "7":
+                    self.manage_community()
+                elif choice == "8":
+                    self.build_website()
+                elif choice == "9":
+                    self.backup_data()
+                elif choice == "10":
+                    self.manage_preview()
+                elif choice == "0":
+                    print("\nGoodbye! 👋")
+                    break
+                else:
+                    print("Invalid choice. Please try again.")
+                
+                if choice != "0":
+                    input("\nPress Enter to continue...")
+        finally:
+            self.stop_dev_server()
+            self.stop_validator()
 
-if __name__ == "__main__":
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point: interactive menu by default, or a one-shot command"""
+    if not (sys.argv[1:] if argv is None else argv):
+        # Straight to the menu without building the command-line parser
+        CVManager().run()
+        return 0
+    
+    import argparse
+    parser = argparse.ArgumentParser(description="CV Website Content Manager")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    commands.add_parser("refresh", help="Regenerate content metadata and derived data from every section")
+    commands.add_parser("manifest", help="Hash dist/ and show what changed since the previous build")
+    deploy = commands.add_parser("deploy", help="Copy only changed dist/ files to a local deploy directory")
+    deploy.add_argument("target", type=Path, help="Deploy target directory")
+    deploy.add_argument("--dry-run", action="store_true", help="Show the changeset without copying")
+    images = commands.add_parser("images", help="Generate responsive variants for project gallery images")
+    images.add_argument("--force", action="store_true", help="Reprocess images even when cached")
+    migrate = commands.add_parser("migrate", help="Switch the data store between TypeScript, sharded "
+                                                  "projects and canonical JSON")
+    migrate.add_argument("--to", choices=("json", "ts", "shards"), required=True,
+                         help="Target storage mode (shards: one projects/<slug>.ts per project)")
+    commands.add_parser("db", help="Build or resync the SQLite mirror used by list views")
+    listing = commands.add_parser("list", help="List a section page by page with filters")
+    listing.add_argument("section", choices=("skills", "experience", "projects", "education",
+                                             "certifications", "community"))
+    for name in ("tech", "company", "issuer", "year", "expires", "text"):
+        listing.add_argument(f"--{name}", help=f"Filter by {name}")
+    listing.add_argument("--sort", default="position",
+                         choices=("position", "title", "company", "issuer", "date"))
+    listing.add_argument("--page", type=int, default=1)
+    listing.add_argument("--page-size", type=int, default=10)
+    replace = commands.add_parser("replace", help="Find and replace text across every data section")
+    replace.add_argument("find", help="Text (or regular expression with --regex) to find")
+    replace.add_argument("replacement", help="Replacement text (may use \\1 backreferences with --regex)")
+    replace.add_argument("--regex", action="store_true", help="Treat FIND as a regular expression")
+    replace.add_argument("-i", "--ignore-case", action="store_true", help="Match case-insensitively")
+    replace.add_argument("--field", action="append", help="Only replace inside this field (repeatable)")
+    replace.add_argument("--section", action="append", choices=("personal", "skills", "experience", "projects",
+                                                                "education", "certifications", "community"),
+                         help="Only search this section (repeatable)")
+    replace.add_argument("--apply", action="store_true", help="Write the changes (default is a dry run)")
+    timeline = commands.add_parser("timeline", help="Show normalised periods, overlaps, gaps and total time")
+    timeline.add_argument("section", nargs="?", default="experience",
+                          choices=("experience", "education", "certifications", "community"))
+    export = commands.add_parser("export", help="Render the CV as Markdown, text, HTML and JSON Resume")
+    export.add_argument("--format", action="append", choices=("md", "txt", "html", "json"),
+                        help="Format to render (repeatable; default all)")
+    export.add_argument("--out", type=Path, help="Output directory (default cv-exports/)")
+    commands.add_parser("search-index", help="Regenerate the sharded client search index in public/search/")
+    commands.add_parser("validate", help="Check the data against the zod schemas in src/data/schemas.ts")
+    commands.add_parser("stale", help="List site outputs changed since the last successful build")
+    commands.add_parser("probe-images", help="Record gallery image dimensions, sizes and hashes")
+    commands.add_parser("headers", help="Write dist/_headers with cache tiers for every built file")
+    commands.add_parser("api", help="Regenerate the per-resource static JSON API in public/api/")
+    commands.add_parser("build", help="Build the website and record timings")
+    startup = commands.add_parser("startup", help="Benchmark time to the menu and to one-shot command output")
+    startup.add_argument("--runs", type=int, default=5, help="Runs per command (median is reported)")
+    startup.add_argument("--budget", action="append", default=[], metavar="COMMAND=MULTIPLE",
+                         help="Override a budget, in multiples of a bare interpreter start (repeatable)")
+    commands.add_parser("budget", help="Check per-page weight of dist/ against budgets")
+    serve = commands.add_parser("serve", help="Serve dist/ with production-like caching and compression")
+    serve.add_argument("--port", type=int, help="Port to listen on (default 8080)")
+    commands.add_parser("compress", help="Write gzip/brotli siblings for compressible dist/ files")
+    trends = commands.add_parser("build-trends", help="Show build timing history and flag regressions")
+    trends.add_argument("--threshold", type=float, help="Percent slower than baseline to flag (default 20)")
+    trends.add_argument("--limit", type=int, default=20, help="Number of recent builds to show")
+    args = parser.parse_args(argv)
+    
     manager = CVManager()
-    manager.run()
\ No newline at end of file
+    if args.command is None:
+        manager.run()
+    elif args.command == "refresh":
+        manager.refresh_artifacts()
+        print(f"✓ Refreshed {manager.content_meta_file.name} and {manager.derived_file.name}")
+    elif args.command == "manifest":
+        if manager.update_deploy_manifest() is None:
+            return 1
+    elif args.command == "deploy":
+        if not manager.dist_path.is_dir():
+            print("No dist/ directory found. Build the website first.")
+            return 1
+        manager.deploy_to_directory(args.target, dry_run=args.dry_run)
+    elif args.command == "images":
+        if manager.generate_image_variants(force=args.force) is None:
+            return 1
+    elif args.command == "migrate":
+        if args.to == manager.storage_mode:
+            print(f"Data store is already in {args.to.upper()} mode.")
+            return 0
+        manager.migrate_store(args.to)
+        print(f"✓ Data store is now in {args.to.upper()} mode")
+    elif args.command == "db":
+        manager.rebuild_db()
+        print(f"✓ SQLite mirror ready: {manager.db_file}")
+    elif args.command == "list":
+        filters = {name: getattr(args, name) for name in manager.list_filters if getattr(args, name)}
+        rows, total, has_more = manager.list_entries(args.section, filters, args.sort,
+                                                     args.page, args.page_size)
+        for i, entry in enumerate(rows, (args.page - 1) * args.page_size + 1):
+            manager.print_entry(args.section, i, entry)
+        print(f"\n-- {manager.page_label(args.page, args.page_size, total, has_more)} --")
+    elif args.command == "compress":
+        if manager.precompress_dist() is None:
+            return 1
+    elif args.command == "replace":
+        manager.replace_across_sections(args.find, args.replacement, regex=args.regex, fields=args.field,
+                                        sections=args.section, ignore_case=args.ignore_case, apply=args.apply)
+    elif args.command == "timeline":
+        manager.show_timeline(args.section)
+    elif args.command == "export":
+        manager.export_cv(args.format, args.out)
+    elif args.command == "search-index":
+        stats = manager.update_search_index()
+        print(f"✓ Search index: {stats['docs']} documents in {stats['shards']} shards "
+              f"({stats['written']} file(s) written, {stats['removed']} removed)")
+    elif args.command == "validate":
+        derived_current = manager.derived_data_current()
+        if not derived_current:
+            print(f"✗ {manager.derived_file.name} is out of date with the data files; "
+                  "run: python3 cv_manager.py refresh")
+        result = manager.validate_with_schema()
+        manager.stop_validator()
+        if result is None:
+            return 1
+        manager.report_schema_issues(*result, limit=len(result[0]))
+        return 0 if not result[0] and derived_current else 1
+    elif args.command == "stale":
+        manager.show_stale_outputs()
+    elif args.command == "probe-images":
+        manager.probe_gallery_images()
+    elif args.command == "headers":
+        if manager.write_cache_headers() is None:
+            return 1
+    elif args.command == "api":
+        stats = manager.write_static_api()
+        print(f"✓ Static API: {stats['resources']} resources ({stats['written']} written, "
+              f"{stats['removed']} removed)")
+    elif args.command == "budget":
+        return 0 if manager.check_page_budgets() else 1
+    elif args.command == "serve":
+        manager.serve_dist(args.port)
+    elif args.command == "startup":
+        try:
+            budgets = {name: float(multiple) for name, multiple in
+                       (override.rsplit("=", 1) for override in args.budget)}
+        except ValueError:
+            print("✗ --budget expects COMMAND=MULTIPLE, e.g. menu=4")
+            return 2
+        unknown = sorted(set(budgets) - set(manager.startup_budgets))
+        if unknown:
+            print(f"✗ No startup budget for: {', '.join(unknown)} (known: {', '.join(manager.startup_budgets)})")
+            return 2
+        return 0 if manager.benchmark_startup(args.runs, budgets) else 1
+    elif args.command == "build":
+        return 0 if manager.build_website() else 1
+    elif args.command == "build-trends":
+        return 0 if manager.show_build_trends(args.threshold, args.limit) else 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
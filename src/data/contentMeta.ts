@@ -0,0 +1,43 @@
+import contentMeta from './content-meta.json';
+
+// Content hashes and change times recorded by cv_manager.py on every write.
+// Feeds and sitemaps read dates from here so unchanged content builds identically.
+
+export interface ContentStamp {
+  hash: string;
+  firstSeen: string;
+  lastModified: string;
+}
+
+interface SectionStamp extends ContentStamp {
+  entries?: Record<string, ContentStamp>;
+}
+
+const sections = (contentMeta as { sections: Record<string, SectionStamp> }).sections;
+
+// Fixed fallback so a missing record never reintroduces build-time dates
+const FALLBACK_DATE = '1970-01-01T00:00:00+00:00';
+
+// Get the stamp for one entry (projects are keyed by slug)
+export function getEntryStamp(section: string, key: string): ContentStamp | undefined {
+  return sections[section]?.entries?.[key];
+}
+
+// Latest change across the given sections (all sections when none are given)
+export function getLastModified(...names: string[]): Date {
+  const stamps = (names.length ? names : Object.keys(sections))
+    .map(name => sections[name]?.lastModified)
+    .filter((value): value is string => !!value);
+  const latest = stamps.map(value => new Date(value).getTime());
+  return new Date(latest.length ? Math.max(...latest) : FALLBACK_DATE);
+}
+
+// Publication and modification dates for a project, falling back to its section
+export function getProjectDates(slug: string): { published: Date; modified: Date } {
+  const stamp = getEntryStamp('projects', slug);
+  const fallback = getLastModified('projects');
+  return {
+    published: stamp ? new Date(stamp.firstSeen) : fallback,
+    modified: stamp ? new Date(stamp.lastModified) : fallback,
+  };
+}
@@ -0,0 +1,6 @@
+// Generated by cv_manager.py from the data modules - do not edit by hand.
+// Regenerate with: python3 cv_manager.py refresh
+
+export const technologies: string[] = ["ARM Templates", "AWS", "Agile", "Ansible", "ArgoCD", "Authelia", "Azure", "Azure DevOps", "Azure Monitor", "Azure Storage", "Backup Strategies", "Bash", "Bash Scripting", "CI/CD", "Chart.js", "Cloud Architecture", "CloudFormation", "Container Security", "Cost Optimization", "Docker", "Documentation", "ELK Stack", "Git", "GitHub Actions", "GitLab CI", "GitOps", "Grafana", "Helm", "Infrastructure as Code", "Jenkins", "K3s", "Kubernetes", "LLDAP", "Linux", "Longhorn", "Markdown", "Matplotlib", "MetalLB", "MongoDB", "MySQL", "Network Policies", "Node.js", "NumPy", "OWASP", "Pandas", "Persistent Volumes", "PostgreSQL", "Prometheus", "PyInstaller", "Python", "Python Automation", "RBAC", "React", "Renovate", "Service Mesh", "Shell Scripting", "Tailwind CSS", "Terraform", "Tkinter", "Traefik", "TypeScript", "Vite", "Zero Trust"];
+export const projectStats: { total: number; withLiveDemo: number; openSource: number; technologies: number } = {"total": 8, "withLiveDemo": 2, "openSource": 8, "technologies": 32};
+export const experienceRanges: [string, string | null][] = [["2019-01", null]];
@@ -0,0 +1,63 @@
+import imageVariants from './image-variants.json';
+import imageMeta from './image-meta.json';
+
+// Responsive variants and header-probed metadata generated by cv_manager.py for project gallery images.
+
+interface Variant {
+  src: string;
+  width: number;
+  height: number;
+  bytes: number;
+}
+
+interface VariantEntry {
+  width: number;
+  height: number;
+  variants: Record<string, Variant[]>;
+}
+
+export interface ImageMeta {
+  width: number | null;
+  height: number | null;
+  bytes: number;
+  hash: string;
+  format: string;
+}
+
+export interface ResponsiveImage {
+  sources: { type: string; srcset: string }[];
+  src: string;
+  srcset?: string;
+  width?: number;
+  height?: number;
+}
+
+const manifest = imageVariants as Record<string, VariantEntry>;
+const meta = imageMeta as Record<string, ImageMeta>;
+
+// Gallery images render at most at half the content width on large screens
+export const gallerySizes = '(min-width: 960px) 50vw, 100vw';
+
+const toSrcset = (variants: Variant[]) =>
+  variants.map(variant => `${variant.src} ${variant.width}w`).join(', ');
+
+// Get <picture> sources for an image, falling back to the original file
+export function getResponsiveImage(src: string): ResponsiveImage {
+  const entry = manifest[src];
+  if (!entry) {
+    // No variants yet: still reserve layout space from the probed dimensions
+    const probed = meta[src];
+    return { sources: [], src, width: probed?.width ?? undefined, height: probed?.height ?? undefined };
+  }
+
+  const { png, ...modern } = entry.variants;
+  return {
+    sources: ['avif', 'webp']
+      .filter(format => modern[format]?.length)
+      .map(format => ({ type: `image/${format}`, srcset: toSrcset(modern[format]) })),
+    src: png?.length ? png[png.length - 1].src : src,
+    srcset: png?.length ? toSrcset(png) : undefined,
+    width: entry.width,
+    height: entry.height,
+  };
+}
@@ -6,6 +6,7 @@ import { education, type Education } from './education';
 import { certifications, type Certification } from './certifications';
 import { community, type Community } from './community';
 import { CVDataSchema } from './schemas';
+import * as derived from './derived';
 
 // Re-export types for external use
 export type { Personal, Skills, Experience, Project, Education, Certification, Community };
@@ -62,6 +63,14 @@ function validateCVData(data: CVData): CVData {
 // Main validated export
 export const cvData: CVData = validateCVData(rawData);
 
+// Entry lookups stay here (cheap, and always match cvData even after hand edits);
+// list-wide aggregates are precomputed by cv_manager.py on write (see derived.ts)
+const isPlanned = (cert: Certification) => cert.date.toLowerCase().includes('planned');
+const currentRole = cvData.experience.find(role => /\b(present|current|now|ongoing)\b/i.test(role.period))
+  ?? cvData.experience[0];
+const earnedCertifications = cvData.certifications.filter(cert => !isPlanned(cert));
+const plannedCertifications = cvData.certifications.filter(isPlanned);
+
 // Utility functions for common operations
 export const cvUtils = {
   // Find project by slug
@@ -69,9 +78,9 @@ export const cvUtils = {
     return cvData.projects.find(p => p.slug === slug);
   },
   
-  // Get current role (most recent experience)
+  // Get current role (the ongoing one, else the most recent experience)
   getCurrentRole: (): Experience | undefined => {
-    return cvData.experience[0];
+    return currentRole;
   },
   
   // Get featured projects (those with live URLs)
@@ -81,30 +90,20 @@ export const cvUtils = {
   
   // Get all tech stack items (unique)
   getAllTechnologies: (): string[] => {
-    const techSet = new Set<string>();
-    
-    // From skills
-    Object.values(cvData.skills).forEach(skillList => {
-      skillList.forEach(skill => techSet.add(skill));
-    });
-    
-    // From projects
-    cvData.projects.forEach(project => {
-      project.techStack.forEach(tech => techSet.add(tech));
-    });
-    
-    return Array.from(techSet).sort();
+    return derived.technologies;
   },
   
-  // Get experience duration in years
+  // Get experience duration in whole years (overlapping roles counted once)
   getTotalExperience: (): number => {
-    const firstJob = cvData.experience[cvData.experience.length - 1];
-    if (!firstJob) return 0;
-    
-    const startYear = parseInt(firstJob.period.match(/\d{4}/)?.[0] || '0');
-    const currentYear = new Date().getFullYear();
-    
-    return currentYear - startYear;
+    const now = new Date();
+    const toMonth = (value: string) => {
+      const [year, month] = value.split('-').map(Number);
+      return year * 12 + month - 1;
+    };
+    const current = now.getFullYear() * 12 + now.getMonth();
+    const months = derived.experienceRanges.reduce(
+      (total, [start, end]) => total + Math.max(0, (end ? toMonth(end) : current) - toMonth(start) + 1), 0);
+    return Math.floor(months / 12);
   },
   
   // Get skills by category
@@ -121,12 +120,7 @@ export const cvUtils = {
   }),
   
   // Get project metrics summary
-  getProjectStats: () => ({
-    total: cvData.projects.length,
-    withLiveDemo: cvData.projects.filter(p => p.live).length,
-    openSource: cvData.projects.filter(p => p.github).length,
-    technologies: new Set(cvData.projects.flatMap(p => p.techStack)).size
-  }),
+  getProjectStats: () => derived.projectStats,
   
   // Search projects by technology
   getProjectsByTech: (tech: string): Project[] => {
@@ -142,16 +136,12 @@ export const cvUtils = {
   
   // Get earned certifications (not planned)
   getEarnedCertifications: (): Certification[] => {
-    return cvData.certifications.filter(cert => 
-      !cert.date.toLowerCase().includes('planned')
-    );
+    return earnedCertifications;
   },
   
   // Get planned certifications
   getPlannedCertifications: (): Certification[] => {
-    return cvData.certifications.filter(cert => 
-      cert.date.toLowerCase().includes('planned')
-    );
+    return plannedCertifications;
   },
   
   // Check if has community involvement
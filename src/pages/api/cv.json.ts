@@ -1,11 +1,12 @@
 import type { APIRoute } from 'astro';
 import { cvData, cvUtils } from '../../data';
+import { getLastModified } from '../../data/contentMeta';
 
 export const GET: APIRoute = async () => {
   // Create a simplified version for API consumption
   const apiData = {
     meta: {
-      generated: new Date().toISOString(),
+      generated: getLastModified().toISOString(),
       version: '1.0.0',
     },
     personal: {
@@ -1,5 +1,6 @@
 import type { APIRoute } from 'astro';
 import { cvData, metaData } from '../data';
+import { getLastModified, getProjectDates } from '../data/contentMeta';
 
 export const GET: APIRoute = async ({ site }) => {
   const siteUrl = (site?.toString() || 'https://haashim-alvi.netlify.app').replace(/\/$/, '');
@@ -13,7 +14,7 @@ export const GET: APIRoute = async ({ site }) => {
     <link>${siteUrl}</link>
     <language>en-gb</language>
     <atom:link href="${siteUrl}/rss.xml" rel="self" type="application/rss+xml"/>
-    <lastBuildDate>${new Date().toUTCString()}</lastBuildDate>
+    <lastBuildDate>${getLastModified('projects', 'personal').toUTCString()}</lastBuildDate>
     <managingEditor>${cvData.personal.contact.email} (${cvData.personal.name})</managingEditor>
     <webMaster>${cvData.personal.contact.email} (${cvData.personal.name})</webMaster>
     
@@ -28,7 +29,7 @@ ${cvData.projects.map(project => `    <item>
       ]]></description>
       <link>${siteUrl}/projects/${project.slug}</link>
       <guid isPermaLink="true">${siteUrl}/projects/${project.slug}</guid>
-      <pubDate>${new Date().toUTCString()}</pubDate>
+      <pubDate>${getProjectDates(project.slug).published.toUTCString()}</pubDate>
       <category>Projects</category>
       ${project.techStack.map(tech => `<category>${tech}</category>`).join('\n      ')}
     </item>`).join('\n')}
@@ -1,5 +1,6 @@
 import type { APIRoute } from 'astro';
 import { cvData } from '../data';
+import { getLastModified, getProjectDates } from '../data/contentMeta';
 
 export const GET: APIRoute = async ({ site }) => {
   const siteUrl = (site?.toString() || 'https://haashim-alvi.netlify.app').replace(/\/$/, '');
@@ -17,12 +18,18 @@ export const GET: APIRoute = async ({ site }) => {
   
   const allPages = [...staticPages, ...projectPages];
   
+  // Dates come from recorded content changes, not the build clock
+  const siteModified = getLastModified();
+  const lastmod = (page: string) => page.startsWith('projects/')
+    ? getProjectDates(page.slice('projects/'.length)).modified
+    : siteModified;
+  
   // Generate sitemap XML
   const sitemap = `<?xml version="1.0" encoding="UTF-8"?>
 <urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
 ${allPages.map(page => `  <url>
     <loc>${siteUrl}${page ? '/' + page : ''}</loc>
-    <lastmod>${new Date().toISOString()}</lastmod>
+    <lastmod>${lastmod(page).toISOString()}</lastmod>
     <changefreq>${page === '' ? 'weekly' : 'monthly'}</changefreq>
     <priority>${page === '' ? '1.0' : page.startsWith('projects/') ? '0.8' : '0.5'}</priority>
   </url>`).join('\n')}
@@ -0,0 +1,104 @@
+// Client for the prefix-sharded search index generated by cv_manager.py (public/search/).
+// A query loads the manifest, one small shard per term prefix, and only the display-data
+// shards (section + slug prefix) of the results it returns.
+
+export interface SearchResult {
+  id: string;
+  section: string;
+  title: string;
+  url: string;
+  snippet: string;
+  score: number;
+}
+
+interface Manifest {
+  version: number;
+  prefixLength: number;
+  docPrefixLength: number;
+  docs: Record<string, string>;
+  shards: Record<string, string>;
+}
+
+type Shard = Record<string, Record<string, number>>;
+type Docs = Record<string, { c: string; t: string; u: string; s: string }>;
+
+const BASE = '/search/';
+const STOPWORDS = new Set(
+  'an and are as at be by for from has in into is it of on or our that the this to via was were with'.split(' ')
+);
+
+let manifestRequest: Promise<Manifest> | undefined;
+const shardRequests = new Map<string, Promise<Shard>>();
+const docRequests = new Map<string, Promise<Docs>>();
+
+const fetchJson = <T>(path: string): Promise<T> =>
+  fetch(`${BASE}${path}`).then(response => response.json() as Promise<T>);
+
+const loadManifest = () => (manifestRequest ??= fetchJson<Manifest>('index.json'));
+
+function loadShard(key: string, hash: string): Promise<Shard> {
+  if (!shardRequests.has(key)) shardRequests.set(key, fetchJson<Shard>(`${key}.json?v=${hash}`));
+  return shardRequests.get(key)!;
+}
+
+// Same keys as CVManager.search_doc_key
+function docKey(id: string, prefixLength: number): string {
+  const split = id.indexOf(':');
+  return `${id.slice(0, split)}-${id.slice(split + 1, split + 1 + prefixLength).replace(/[^a-z0-9]/g, '_')}`;
+}
+
+function loadDocs(key: string, hash: string): Promise<Docs> {
+  if (!docRequests.has(key)) docRequests.set(key, fetchJson<Docs>(`docs/${key}.json?v=${hash}`));
+  return docRequests.get(key)!;
+}
+
+// Same tokenisation as CVManager.search_terms
+export function tokenize(text: string): string[] {
+  const tokens = text.toLowerCase().match(/[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*/g) ?? [];
+  return tokens.filter(token => token.length > 1 && !STOPWORDS.has(token));
+}
+
+// Search projects, skills and experience; every query term must match (the last one as a prefix)
+export async function search(query: string, limit = 10): Promise<SearchResult[]> {
+  const terms = tokenize(query);
+  if (!terms.length) return [];
+
+  const manifest = await loadManifest();
+  const perTerm = await Promise.all(terms.map(async (term, i) => {
+    const prefix = term.slice(0, manifest.prefixLength).replace(/[^a-z0-9]/g, '_');
+    const hash = manifest.shards[prefix];
+    const scores = new Map<string, number>();
+    if (!hash) return scores;
+
+    const shard = await loadShard(prefix, hash);
+    const isLast = i === terms.length - 1;
+    for (const [candidate, postings] of Object.entries(shard)) {
+      // Exact matches count fully; the term being typed also matches longer terms
+      const weight = candidate === term ? 1 : isLast && candidate.startsWith(term) ? 0.5 : 0;
+      if (!weight) continue;
+      for (const [id, score] of Object.entries(postings)) {
+        scores.set(id, Math.max(scores.get(id) ?? 0, score * weight));
+      }
+    }
+    return scores;
+  }));
+
+  const [first, ...rest] = perTerm;
+  const ranked = [...first.entries()]
+    .filter(([id]) => rest.every(scores => scores.has(id)))
+    .map(([id, score]) => [id, rest.reduce((total, scores) => total + scores.get(id)!, score)] as const)
+    .sort((a, b) => b[1] - a[1])
+    .slice(0, limit);
+  if (!ranked.length) return [];
+
+  const keys = [...new Set(ranked.map(([id]) => docKey(id, manifest.docPrefixLength)))];
+  const docs: Docs = Object.assign({}, ...await Promise.all(keys.map(key => loadDocs(key, manifest.docs[key]))));
+  return ranked.map(([id, score]) => ({
+    id,
+    section: docs[id].c,
+    title: docs[id].t,
+    url: docs[id].u,
+    snippet: docs[id].s,
+    score,
+  }));
+}
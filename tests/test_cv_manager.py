@@ -0,0 +1,617 @@
+"""Regression tests for cv_manager.py, run against a scratch copy of the data"""
+
+import copy
+import importlib.util
+import json
+import os
+import re
+import shutil
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    """A CVManager rooted in a temporary copy of cv_manager.py and src/data"""
+    shutil.copy(ROOT / "cv_manager.py", tmp_path)
+    shutil.copytree(ROOT / "src" / "data", tmp_path / "src" / "data")
+    (tmp_path / "public").mkdir()
+    spec = importlib.util.spec_from_file_location("cv_manager_under_test", tmp_path / "cv_manager.py")
+    module = importlib.util.module_from_spec(spec)
+    # Registered so worker processes (exports) can unpickle its functions
+    monkeypatch.setitem(sys.modules, spec.name, module)
+    spec.loader.exec_module(module)
+    cv_manager = module.CVManager()
+    cv_manager.validate_on_write = False
+    return cv_manager
+
+
+def test_in_place_edit_in_shard_mode_is_written(manager):
+    manager.migrate_store("shards")
+    # The "Update project" menu edits the parsed entries in place before writing them back
+    data = manager.parse_ts_file(manager.source_file("projects"))
+    data[0]["name"] = "Renamed One"
+    manager.write_ts_file(manager.source_file("projects"), data, "projects", "Project")
+
+    shard = manager.project_shards_dir / f"{manager.shard_stem(data[0])}.ts"
+    assert "Renamed One" in shard.read_text()
+    manager._shard_cache.clear()
+    assert manager.parse_ts_file(manager.source_file("projects"))[0]["name"] == "Renamed One"
+
+
+def test_repeated_in_place_edits_are_each_detected(manager):
+    data = manager.parse_ts_file(manager.source_file("projects"))
+    data[0]["description"] = "First rewrite of this description"
+    manager.write_ts_file(manager.source_file("projects"), data, "projects", "Project")
+    data[0]["description"] = "Second rewrite of this description"
+    manager.write_ts_file(manager.source_file("projects"), data, "projects", "Project")
+
+    assert manager.load_section("projects")[0]["description"] == "Second rewrite of this description"
+    assert "Second rewrite" in (manager.base_path / "projects.ts").read_text()
+
+
+def test_db_mirror_resyncs_after_outside_edits(manager):
+    manager.rebuild_db()
+    projects = manager.base_path / "projects.ts"
+    name = manager.load_section("projects")[0]["name"]
+    projects.write_text(projects.read_text().replace(name, "Edited By Hand"))
+
+    rows, _, _ = manager.list_entries("projects", {}, page_size=50)
+    assert "Edited By Hand" in [row["name"] for row in rows]
+    assert name not in [row["name"] for row in rows]
+
+
+# Minimal stand-ins for the zod and esbuild packages, enough to drive the real worker script
+FAKE_ZOD = """
+const check = (test, message) => (value, path, issues) => {
+  if (!test(value)) issues.push({ path, code: 'custom', message });
+};
+class Schema {
+  constructor(run) { this.run = run; }
+  safeParse(value) {
+    const issues = [];
+    this.run(value, [], issues);
+    return issues.length ? { success: false, error: { issues } } : { success: true, data: value };
+  }
+}
+export const z = {
+  slugs: message => new Schema((value, path, issues) => value.projects.forEach((project, i) =>
+    check(v => /^[a-z0-9-]+$/.test(v), message)(project.slug, ['projects', i, 'slug'], issues))),
+  anything: () => new Schema(() => {}),
+};
+"""
+FAKE_ESBUILD = "exports.transformSync = source => ({ code: source });"
+SCHEMAS = "import { z } from 'zod';\nexport const CVDataSchema = z.%s;\n"
+
+
+@pytest.fixture
+def validating_manager(manager):
+    if not shutil.which("node"):
+        pytest.skip("node is not installed")
+    shutil.copy(ROOT / "cv-validate-worker.mjs", manager.root)
+    modules = manager.root / "node_modules"
+    (modules / "zod").mkdir(parents=True)
+    (modules / "zod" / "package.json").write_text('{"type": "module", "exports": "./index.js"}')
+    (modules / "zod" / "index.js").write_text(FAKE_ZOD)
+    (modules / "esbuild").mkdir()
+    (modules / "esbuild" / "index.js").write_text(FAKE_ESBUILD)
+    manager.schemas_file.write_text(SCHEMAS % "slugs('Slug must be URL-friendly')")
+    yield manager
+    manager.stop_validator()
+
+
+def test_worker_reports_issue_paths_before_write(validating_manager, capsys):
+    manager = validating_manager
+    issues, _ = manager.validate_with_schema()
+    assert issues == []
+
+    data = manager.parse_ts_file(manager.source_file("projects"))
+    data[1]["slug"] = "Not A Slug"
+    manager.validate_on_write = True
+    manager.write_ts_file(manager.source_file("projects"), data, "projects", "Project")
+    output = capsys.readouterr().out
+    assert "projects[1].slug: Slug must be URL-friendly" in output
+    assert output.index("projects[1].slug") < output.index("✓ Updated projects.ts")
+
+
+def test_worker_restarts_when_schemas_change(validating_manager):
+    manager = validating_manager
+    data = {"projects": [{"slug": "Bad Slug"}]}
+    assert len(manager.validate_with_schema(data)[0]) == 1
+    first = manager.validator.pid
+
+    manager.schemas_file.write_text(SCHEMAS % "anything()")
+    stat = manager.schemas_file.stat()
+    os.utime(manager.schemas_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert manager.validate_with_schema(data)[0] == []
+    assert manager.validator.pid != first
+
+
+def test_shard_index_aliases_are_valid_identifiers(manager):
+    data = manager.parse_ts_file(manager.source_file("projects"))
+    data[0]["slug"], data[1]["slug"] = "2048-game", "projects"
+    manager.write_ts_file(manager.source_file("projects"), data, "projects", "Project")
+    manager.migrate_store("shards")
+
+    index = (manager.base_path / "projects.ts").read_text()
+    aliases = re.findall(r"import \{ project as (\S+) \}", index)
+    assert len(aliases) == len(data)
+    assert all(re.fullmatch(r"[A-Za-z_$][\w$]*", alias) for alias in aliases)
+    assert "projects" not in aliases and len(set(aliases)) == len(aliases)
+    manager._shard_cache.clear()
+    assert [p["slug"] for p in manager.parse_ts_file(manager.source_file("projects"))][:2] == ["2048-game", "projects"]
+
+
+def test_streamed_entries_match_parsed_section_with_commented_apostrophes(manager):
+    experience = manager.base_path / "experience.ts"
+    source = experience.read_text()
+    source = source.replace("= [\n", "= [\n  // Newest first; don't reorder by hand\n", 1)
+    source = source.replace("  },\n  {", "  },\n  /* The company's old entries follow */\n  {", 1)
+    experience.write_text(source)
+
+    assert list(manager.iter_section_entries("experience")) == manager.load_section("experience")
+
+
+def test_project_api_resources_are_keyed_by_slug_with_absolute_links(manager):
+    project = {"name": "Game", "slug": "game-2048", "description": "", "techStack": [], "achievements": [],
+               "github": "github.com/example/game", "live": "https://game.example"}
+    resources = manager.static_api_resources("projects", [project])
+
+    assert resources["projects.json"][0]["resource"] == "/api/projects/game-2048.json"
+    published = resources["projects/game-2048.json"]
+    assert published["github"] == "https://github.com/example/game"
+    assert published["live"] == "https://game.example"
+
+
+def test_replace_field_matches_the_leaf_key_only(manager):
+    data = [{"name": "Alpha", "slug": "alpha", "techStack": ["Alpha"], "description": "Alpha tool"}]
+    changes = []
+    manager.replace_in_value(data[0], re.compile("Alpha"), "Beta", ("projects",), {"name"}, changes)
+    assert [field for field, _, _ in changes] == ["name"]
+
+    changes = []
+    skills = {"Cloud": ["Cloud Run"], "Tools": ["Cloudflare"]}
+    updated = manager.replace_in_value(skills, re.compile("Cloud"), "Sky", ("skills",), {"category"}, changes)
+    assert updated == {"Sky": ["Cloud Run"], "Tools": ["Cloudflare"]}
+    assert manager.replace_across_sections("a", "b", fields=["experience"]) == 0
+
+
+def test_hand_edits_leave_derived_data_flagged_until_regenerated(manager):
+    manager.write_derived_data()
+    assert manager.derived_data_current()
+
+    projects = manager.base_path / "projects.ts"
+    projects.write_text(projects.read_text().replace('"Bash"', '"Zsh"', 1))
+    assert not manager.derived_data_current()
+    assert manager.write_derived_data()
+    assert "Zsh" in manager.derived_file.read_text() and manager.derived_data_current()
+
+
+def test_cache_header_tiers(manager):
+    dist = manager.dist_path
+    for relative in ("index.html", "projects/demo/index.html", "_assets/app.1a2b3c4d.js", "images/photo.png",
+                     "api/cv.json", "search/index.json", "search/ku.json", "search/docs/projects-k.json"):
+        (dist / relative).parent.mkdir(parents=True, exist_ok=True)
+        (dist / relative).write_text("x")
+
+    assert manager.classify_dist_file("_assets/app.1a2b3c4d.js") == "fingerprinted"
+    assert manager.classify_dist_file("images/photo.png") == "stable"
+    assert manager.classify_dist_file("projects/demo/index.html") == "volatile"
+    assert {manager.classify_dist_file(path) for path in ("api/cv.json", "search/ku.json",
+                                                          "search/docs/projects-k.json")} == {"volatile-data"}
+
+    manager.write_cache_headers()
+    lines = [line for line in manager.headers_file.read_text().splitlines() if not line.startswith("#")]
+    rules = dict(zip(lines[::2], lines[1::2]))
+    assert "immutable" in rules["/_assets/*"]
+    assert "max-age=300" in rules["/search/*"]
+    assert "max-age=0" in rules["/"]
+
+
+def test_export_writes_every_format_from_the_data(manager, tmp_path):
+    targets = manager.export_cv(out_dir=tmp_path / "out")
+    assert sorted(targets) == ["html", "json", "md", "txt"]
+
+    name = manager.load_section("personal")["name"]
+    role = manager.load_section("experience")[0]["company"]
+    for fmt in ("md", "txt", "html"):
+        text = targets[fmt].read_text()
+        assert name in text and role in text
+    assert targets["md"].read_text().startswith(f"# {name}\n")
+    assert targets["html"].read_text().rstrip().endswith("</html>")
+    resume = json.loads(targets["json"].read_text())
+    assert resume["basics"]["name"] == name
+    assert len(resume["projects"]) == len(manager.load_section("projects"))
+
+
+def test_markdown_export_escapes_metacharacters(manager, tmp_path):
+    skills = manager.base_path / "skills.ts"
+    skills.write_text(skills.read_text().replace('"Azure", "AWS"', '"C#", "*nix", "snake_case"', 1))
+    markdown = manager.export_cv(["md"], out_dir=tmp_path / "out")["md"].read_text()
+    assert "C\\#, \\*nix, snake\\_case" in markdown
+
+
+def test_parse_period_normalises_free_text_ranges(manager):
+    assert manager.parse_period("Sep 2017 - Jun 2019") == (2017 * 12 + 8, 2019 * 12 + 5)
+    assert manager.parse_period("2022 - 2023") == (2022 * 12, 2023 * 12 + 11)
+    assert manager.parse_period("Jan 2025 - Current") == (2025 * 12, None)
+    assert manager.parse_period("March 2020 to present") == (2020 * 12 + 2, None)
+    assert manager.parse_period("2021") == (2021 * 12, 2021 * 12 + 11)
+    assert manager.parse_period("Planned 2026") is None
+    assert manager.parse_period("Unknown") is None
+
+
+def test_period_issues_reports_overlaps_and_gaps_but_not_shared_years(manager):
+    entries = [{"title": "A", "company": "X", "period": "Jan 2018 - Jun 2019"},
+               {"title": "B", "company": "Y", "period": "Mar 2019 - Dec 2019"},
+               {"title": "C", "company": "Z", "period": "Apr 2020 - Current"}]
+    issues = manager.period_issues("experience", entries)
+    assert [issue.split(":")[0] for issue in issues] == ["overlap of 4 month(s)", "gap of 3 month(s)"]
+
+    coarse = [{"title": "A", "company": "X", "period": "2021 - 2022"},
+              {"title": "B", "company": "Y", "period": "2022 - 2023"}]
+    assert manager.period_issues("experience", coarse) == []
+
+
+def test_replace_previews_until_applied_then_writes_once(manager, capsys):
+    files = {section: manager.source_file(section) for section in manager.data_files}
+    before = {section: path.read_text() for section, path in files.items()}
+
+    count = manager.replace_across_sections("Kubernetes", "K8s")
+    assert count > 1
+    assert {section: path.read_text() for section, path in files.items()} == before
+    assert "Re-run with --apply" in capsys.readouterr().out
+
+    assert manager.replace_across_sections("Kubernetes", "K8s", apply=True) == count
+    changed = {section for section, path in files.items() if path.read_text() != before[section]}
+    output = capsys.readouterr().out
+    assert all(output.count(f"✓ Updated {files[section].name}\n") == 1 for section in changed)
+    assert changed and all("Kubernetes" not in str(manager.load_section(section)) for section in changed)
+    assert manager.replace_across_sections("Kubernetes", "K8s") == 0
+
+
+def test_page_budgets_count_referenced_assets_and_apply_overrides(manager, capsys):
+    dist = manager.dist_path
+    (dist / "_assets").mkdir(parents=True)
+    (dist / "projects" / "demo").mkdir(parents=True)
+    (dist / "_assets" / "site.css").write_text("body { color: black; }\n" * 50)
+    for name, size in (("hero-480.avif", 3000), ("hero-960.avif", 6000), ("hero.png", 20000)):
+        (dist / "_assets" / name).write_bytes(os.urandom(size))
+    page = ('<link rel="stylesheet" href="/_assets/site.css"><picture>'
+            '<source type="image/avif" srcset="/_assets/hero-480.avif 480w, /_assets/hero-960.avif 960w">'
+            '<img src="/_assets/hero.png"></picture>')
+    (dist / "index.html").write_text(page)
+    (dist / "projects" / "demo" / "index.html").write_text(page)
+
+    assets = manager.page_assets(dist / "index.html")
+    assert [path.name for path in assets["images"]] == ["hero-960.avif"]
+    assert [path.name for path in assets["css"]] == ["site.css"]
+
+    manager.page_budgets_file.write_text(json.dumps(
+        {"default": {"images": 5000}, "pages": {"/projects/*": {"images": 10000}}}))
+    assert manager.check_page_budgets() is False
+    output = capsys.readouterr().out
+    assert "1 budget(s) exceeded" in output and "  /: images" in output
+
+    manager.page_budgets_file.write_text(json.dumps({"default": {"images": 10000}}))
+    assert manager.check_page_budgets() is True
+
+
+def test_precompression_writes_siblings_and_reuses_cached_output(manager, capsys):
+    import gzip
+    dist = manager.dist_path
+    dist.mkdir()
+    page = "<p>" + "Precompressed page body. " * 200 + "</p>\n"
+    (dist / "index.html").write_text(page)
+    (dist / "photo.png").write_bytes(os.urandom(2048))
+
+    manager.precompress_dist()
+    assert gzip.decompress((dist / "index.html.gz").read_bytes()).decode() == page
+    assert not (dist / "photo.png.gz").exists()
+    assert "1 compressed, 0 from cache" in capsys.readouterr().out
+
+    (dist / "index.html.gz").unlink()  # A fresh build starts without siblings
+    manager.precompress_dist()
+    assert (dist / "index.html.gz").exists()
+    assert "0 compressed, 1 from cache" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("section, filters, sort", [
+    ("projects", {}, "position"),
+    ("projects", {"tech": "bash"}, "position"),
+    ("projects", {"text": "terraform"}, "title"),
+    ("experience", {}, "date"),
+    ("experience", {"year": "2024"}, "company"),
+    ("certifications", {}, "issuer"),
+    ("certifications", {"text": "azure"}, "date"),
+    ("education", {"year": "2019"}, "position"),
+    ("community", {}, "title"),
+])
+def test_sqlite_queries_match_the_in_memory_views(manager, section, filters, sort):
+    in_memory = [manager.list_entries(section, filters, sort, page, page_size=2) for page in (1, 2, 3)]
+    manager.rebuild_db()
+    from_db = [manager.list_entries(section, filters, sort, page, page_size=2) for page in (1, 2, 3)]
+
+    assert any(rows for rows, _, _ in in_memory)
+    assert [(rows, more) for rows, _, more in from_db] == [(rows, more) for rows, _, more in in_memory]
+
+
+def test_migrate_store_round_trips_between_every_layout(manager):
+    def snapshot():
+        manager._section_cache.clear()
+        manager._shard_cache.clear()
+        return {section: manager.load_section(section) for section in manager.data_files}
+
+    original = snapshot()
+    for target in ("json", "shards", "json", "ts", "shards", "ts"):
+        manager.migrate_store(target)
+        assert manager.storage_mode == target
+        assert snapshot() == original, f"data changed after migrating to {target}"
+
+    assert not manager.json_store.exists() and not manager.project_shards_dir.exists()
+    assert not (manager.base_path / "json.migrated").exists()
+    files = {path: path.read_text() for path in manager.base_path.glob("*.ts")}
+    manager.migrate_store("json")
+    manager.migrate_store("ts")
+    assert {path: path.read_text() for path in manager.base_path.glob("*.ts")} == files
+
+
+def test_saving_one_project_rewrites_only_its_shard(manager, capsys):
+    manager.migrate_store("shards")
+    index = manager.base_path / "projects.ts"
+    index_text = index.read_text()
+    capsys.readouterr()
+
+    data = manager.parse_ts_file(manager.source_file("projects"))
+    data[2]["description"] = "Only this project changed"
+    assert manager.write_project_shards(data, manager.load_section("projects")) == 1
+    assert capsys.readouterr().out == f"✓ Updated projects/{manager.shard_stem(data[2])}.ts\n"
+    assert index.read_text() == index_text
+
+    data.append({**data[0], "slug": "copy-of-first", "name": "Copy"})
+    manager.write_project_shards(data, data[:-1])
+    assert "./projects/copy-of-first'" in index.read_text()
+
+
+def test_content_dates_move_only_for_changed_entries(manager):
+    projects = manager.load_section("projects")
+    manager.update_content_meta("projects", projects)
+    meta = json.loads(manager.content_meta_file.read_text())
+    old = "2000-01-01T00:00:00+00:00"
+    record = meta["sections"]["projects"]
+    for stamps in [record, *record["entries"].values()]:
+        stamps["firstSeen"] = stamps["lastModified"] = old
+    manager.content_meta_file.write_text(json.dumps(meta, indent=2, sort_keys=True) + "\n")
+    before = manager.content_meta_file.read_text()
+
+    manager.update_content_meta("projects", copy.deepcopy(projects))
+    assert manager.content_meta_file.read_text() == before
+
+    edited = copy.deepcopy(projects)
+    edited[1]["description"] = "A changed description"
+    manager.update_content_meta("projects", edited)
+    entries = json.loads(manager.content_meta_file.read_text())["sections"]["projects"]["entries"]
+    changed = manager.entry_key("projects", edited[1])
+    assert entries[changed]["lastModified"] != old and entries[changed]["firstSeen"] == old
+    assert all(stamps["lastModified"] == old for key, stamps in entries.items() if key != changed)
+
+
+def test_deploy_changesets_list_only_what_changed(manager, tmp_path):
+    dist = manager.dist_path
+    (dist / "about").mkdir(parents=True)
+    (dist / "index.html").write_text("home")
+    (dist / "about" / "index.html").write_text("about")
+    (dist / "old.css").write_text("old")
+    changeset = manager.update_deploy_manifest()
+    assert len(changeset["added"]) == 3 and not changeset["modified"] and not changeset["removed"]
+
+    (dist / "index.html").write_text("home, rebuilt")
+    (dist / "old.css").unlink()
+    (dist / "new.css").write_text("new")
+    changeset = manager.update_deploy_manifest()
+    assert {kind: [entry["path"] for entry in entries] for kind, entries in changeset.items()} == {
+        "added": ["new.css"], "modified": ["index.html"], "removed": ["old.css"]}
+
+    target = tmp_path / "site"
+    manager.deploy_to_directory(target)
+    (dist / "about" / "index.html").write_text("about, rebuilt")
+    assert manager.deploy_to_directory(target, dry_run=True)["modified"][0]["path"] == "about/index.html"
+    assert (target / "about" / "index.html").read_text() == "about"
+    manager.deploy_to_directory(target)
+    assert (target / "about" / "index.html").read_text() == "about, rebuilt"
+    assert not any(manager.deploy_to_directory(target).values())
+
+
+def test_image_variants_are_bucketed_cached_and_pruned(manager, capsys):
+    Image = pytest.importorskip("PIL.Image")
+    manager.image_formats = ("webp", "png")
+    source = manager.public_path / "images" / "shot.png"
+    source.parent.mkdir(parents=True)
+    Image.new("RGB", (1200, 600), "steelblue").save(source)
+    gallery = ["/images/shot.png"]
+    manager.gallery_sources = lambda: gallery
+
+    manifest = manager.generate_image_variants()
+    entry = manifest["/images/shot.png"]
+    assert [variant["width"] for variant in entry["variants"]["webp"]] == [480, 960]
+    assert entry["variants"]["png"][0]["height"] == 240
+    assert all((manager.public_path / variant["src"].lstrip("/")).exists()
+               for variants in entry["variants"].values() for variant in variants)
+    assert "1 processed, 0 cached" in capsys.readouterr().out
+
+    assert manager.generate_image_variants() == manifest
+    assert "0 processed, 1 cached" in capsys.readouterr().out
+
+    gallery.clear()
+    assert manager.generate_image_variants() == {}
+    assert not any(manager.image_variants_dir.iterdir())
+
+
+def test_probe_reads_raster_dimensions_from_headers(manager, tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+    image = Image.new("RGB", (321, 123), "white")
+    cases = {"a.png": ("PNG", {}), "b.gif": ("GIF", {}), "c.jpg": ("JPEG", {}),
+             "d.jpg": ("JPEG", {"progressive": True}), "e.webp": ("WEBP", {}),
+             "f.webp": ("WEBP", {"lossless": True})}
+    for name, (fmt, options) in cases.items():
+        image.save(tmp_path / name, fmt, **options)
+        expected = {"JPEG": "jpeg"}.get(fmt, fmt.lower())
+        assert manager.probe_image_size(tmp_path / name) == (expected, 321, 123), name
+
+
+def test_probe_reads_svg_sizes_and_records_gallery_meta(manager):
+    images = manager.public_path / "images"
+    images.mkdir()
+    (images / "sized.svg").write_text('<svg xmlns="http://www.w3.org/2000/svg" width="64px" height="32"></svg>')
+    (images / "boxed.svg").write_text('<svg viewBox="0 0 640 480"><rect/></svg>')
+    assert manager.probe_image_size(images / "sized.svg") == ("svg", 64, 32)
+    assert manager.probe_image_size(images / "boxed.svg") == ("svg", 640, 480)
+
+    manager.gallery_sources = lambda: ["/images/boxed.svg", "/images/missing.png"]
+    meta = manager.probe_gallery_images(quiet=True)
+    assert list(meta) == ["/images/boxed.svg"]
+    assert meta["/images/boxed.svg"]["width"] == 640
+    assert meta["/images/boxed.svg"]["bytes"] == (images / "boxed.svg").stat().st_size
+
+
+ASTRO_OUTPUT = """\
+10:00:00 [build] Collecting build info...
+10:00:00 [build] \x1b[32m✓ Completed in 120ms.\x1b[39m
+10:00:00 [build] Building static entrypoints...
+10:00:02 [build] ✓ Completed in 1.50s.
+ generating static routes 
+10:00:02 ▶ src/pages/index.astro
+10:00:02   └─ /index.html (+45ms)
+10:00:02 ▶ src/pages/projects/[slug].astro
+10:00:02   ├─ /projects/a/index.html (+1.20s)
+10:00:02   └─ /projects/b/index.html (+30ms)
+10:00:03 ✓ Completed in 1.30s.
+10:00:03 [build] 3 page(s) built in 2.95s
+"""
+
+
+def test_build_timings_are_parsed_recorded_and_checked_for_regressions(manager, capsys):
+    import subprocess
+    timings = manager.parse_build_output(ASTRO_OUTPUT)
+    assert timings["phases"] == {"Collecting build info": 0.12, "Building static entrypoints": 1.5,
+                                 "generating static routes": 1.3, "total": 2.95}
+    assert timings["pages"]["/projects/a/index.html"] == 1.2
+
+    result = subprocess.CompletedProcess(["npm", "run", "build"], 0, ASTRO_OUTPUT, "")
+    for wall in (10.0, 11.0, 9.0, 10.0):
+        record = manager.record_build(result, wall, {})
+    assert tuple(record["slowestPages"][0]) == ("/projects/a/index.html", 1.2)
+    assert manager.build_baseline(manager.load_build_history(), 3) == 10.0
+    assert manager.show_build_trends(threshold=20) is True
+
+    manager.record_build(result, 13.0, {})
+    assert manager.show_build_trends(threshold=20) is False
+    assert "⚠️ +30%" in capsys.readouterr().out
+
+
+def free_port() -> int:
+    import socket
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_dev_server_is_started_restarted_and_stopped(manager, tmp_path, monkeypatch):
+    # Stand-in for `npx astro dev --host H --port P`: a plain HTTP server on the same address
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    (bin_dir / "npx").write_text(f'#!/bin/sh\nexec {sys.executable} -m http.server "$6" --bind "$4"\n')
+    (bin_dir / "npx").chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    manager.dev_host, manager.dev_port = "127.0.0.1", free_port()
+    assert not manager.dev_server_healthy()
+
+    try:
+        assert manager.start_dev_server(wait=15)
+        first = manager.dev_server
+        assert first is not None and manager.dev_server_healthy()
+
+        first.kill()
+        first.wait()
+        assert manager.ensure_dev_server()
+        assert manager.dev_server is not first and manager.dev_server_healthy()
+    finally:
+        manager.stop_dev_server()
+    assert manager.dev_server is None and not manager.dev_server_healthy()
+
+
+def test_dev_server_adopts_one_already_listening(manager):
+    from http.server import HTTPServer, SimpleHTTPRequestHandler
+    import threading
+    server = HTTPServer(("127.0.0.1", 0), SimpleHTTPRequestHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    manager.dev_host, manager.dev_port = "127.0.0.1", server.server_address[1]
+    try:
+        assert manager.start_dev_server(wait=5)
+        assert manager.dev_server is None  # Adopted, so stopping leaves it alone
+        manager.stop_dev_server()
+        assert manager.dev_server_healthy()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_preview_server_serves_dist_like_production(manager, monkeypatch):
+    import gzip
+    import http.server
+    import threading
+    import urllib.error
+    import urllib.request
+
+    dist = manager.dist_path
+    dist.mkdir()
+    (dist / "index.html").write_text("<h1>Home</h1>")
+    (dist / "index.html.gz").write_bytes(gzip.compress(b"<h1>Home</h1>"))
+    (dist / "about.html").write_text("<h1>About</h1>")
+    (dist / "_headers").write_text("/\n  Cache-Control: public, max-age=0, must-revalidate\n  X-Frame-Options: DENY\n")
+
+    servers = []
+
+    class RecordingServer(http.server.ThreadingHTTPServer):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            servers.append(self)
+
+    monkeypatch.setattr(http.server, "ThreadingHTTPServer", RecordingServer)
+    port = free_port()
+    thread = threading.Thread(target=manager.serve_dist, kwargs={"port": port}, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{port}"
+
+    def fetch(path, **headers):
+        request = urllib.request.Request(base + path, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=5) as response:
+                return response.status, response.headers, response.read()
+        except urllib.error.HTTPError as error:
+            return error.code, error.headers, error.read()
+
+    try:
+        for _ in range(100):
+            if servers:
+                break
+            time.sleep(0.05)
+        status, headers, body = fetch("/", **{"Accept-Encoding": "gzip, br"})
+        assert status == 200 and headers["Content-Encoding"] == "gzip"
+        assert gzip.decompress(body) == b"<h1>Home</h1>"
+        assert headers["X-Frame-Options"] == "DENY"
+
+        status, _, body = fetch("/", **{"Accept-Encoding": "gzip", "If-None-Match": headers["ETag"]})
+        assert (status, body) == (304, b"")
+        assert fetch("/")[1].get("Content-Encoding") is None
+        assert fetch("/about")[2] == b"<h1>About</h1>"
+        assert fetch("/missing")[0] == 404
+        assert fetch("/%2e%2e/cv_manager.py")[0] == 404
+    finally:
+        servers[0].shutdown()
+        thread.join(timeout=5)